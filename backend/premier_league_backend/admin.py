@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Team, Player
+from .models import Team, Player, IngestManifest
 
 admin.site.register(Team)
 admin.site.register(Player)
+admin.site.register(IngestManifest)
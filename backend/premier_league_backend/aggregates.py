@@ -0,0 +1,72 @@
+import pandas as pd
+
+from .models import Player, Team, TeamAggregate
+
+COLUMNS = [
+    'team_id', 'player_id', 'name', 'goals', 'assists', 'expectedGoals',
+    'totalShots', 'shotsOnTarget', 'accuratePasses', 'minutesPlayed',
+]
+SUMMED = {
+    'expectedGoals': 'expected_goals',
+    'totalShots': 'total_shots',
+    'shotsOnTarget': 'shots_on_target',
+    'accuratePasses': 'accurate_passes',
+    'minutesPlayed': 'squad_minutes',
+}
+
+
+def team_aggregate_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per team_id with the TeamAggregate fields, from a season's player rows."""
+    # Sorting first makes every "top" pick deterministic: ties go to the
+    # player_id that sorts first as a string, as on the leaderboards.
+    df = df.sort_values(['team_id', 'player_id'])
+    teams = df.groupby('team_id')
+
+    frame = teams[list(SUMMED)].sum().rename(columns=SUMMED)
+    frame['players_used'] = (df['minutesPlayed'] > 0).groupby(df['team_id']).sum()
+    frame['possession_proxy'] = (
+        50 * frame['accurate_passes'] / frame['accurate_passes'].mean()
+    ).fillna(0.0).round(1)
+
+    for column, name_field, value_field in [
+        ('goals', 'top_scorer', 'top_scorer_goals'),
+        ('assists', 'top_assister', 'top_assister_assists'),
+    ]:
+        best = df.loc[teams[column].idxmax()].set_index('team_id')
+        frame[name_field] = best['name']
+        frame[value_field] = best[column]
+
+    by_minutes = df.sort_values(['team_id', 'minutesPlayed'], ascending=[True, False])
+    top11 = by_minutes[by_minutes.groupby('team_id').cumcount() < 11]
+    frame['top11_minutes_share'] = (
+        100 * top11.groupby('team_id')['minutesPlayed'].sum() / frame['squad_minutes']
+    ).fillna(0.0).round(1)
+    frame['expected_goals'] = frame['expected_goals'].round(2)
+    return frame
+
+
+def rebuild_team_aggregates(season: str) -> int:
+    """Recompute TeamAggregate rows and Team.xg_for for `season` from its players."""
+    df = pd.DataFrame.from_records(
+        Player.objects.filter(season=season).values_list(*COLUMNS), columns=COLUMNS
+    )
+    if df.empty:
+        return 0
+
+    frame = team_aggregate_frame(df)
+    teams = Team.objects.filter(season=season, pk__in=frame.index.tolist())
+    for team in teams:
+        team.xg_for = float(frame.at[team.pk, 'expected_goals'])
+    Team.objects.bulk_update(teams, ['xg_for'])
+
+    fields = [field.name for field in TeamAggregate._meta.concrete_fields if field.name not in ('id', 'team')]
+    TeamAggregate.objects.bulk_create(
+        [
+            TeamAggregate(team_id=team_id, **{field: row[field] for field in fields})
+            for team_id, row in frame.to_dict('index').items()
+        ],
+        update_conflicts=True,
+        unique_fields=['team'],
+        update_fields=fields,
+    )
+    return len(frame)
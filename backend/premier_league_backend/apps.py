@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class PremierLeagueBackendConfig(AppConfig):
     name = 'premier_league_backend'
-    label = 'api'
\ No newline at end of file
+    label = 'api'
+
+    def ready(self):
+        from .db import configure_sqlite
+        from .profiling import install_query_timer, metrics_enabled
+
+        connection_created.connect(configure_sqlite, dispatch_uid='premier_league_backend.configure_sqlite')
+        if metrics_enabled():
+            connection_created.connect(install_query_timer, dispatch_uid='premier_league_backend.query_timer')
@@ -0,0 +1,11 @@
+"""ASGI entry point: uvicorn premier_league_backend.asgi:application (see README)."""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'premier_league_backend.settings')
+# Under ASGI sync code runs on a new thread per request, so persistent
+# connections would never be reused.
+os.environ.setdefault('DJANGO_CONN_MAX_AGE', '0')
+
+application = get_asgi_application()
@@ -0,0 +1,80 @@
+"""Async list endpoints for the ASGI deployment (see asgi.py).
+
+The teams, players and leaderboards lists are what every dashboard client
+polls. Sync views hold a thread for the whole request, so these lists are
+served by async views instead: they reuse the DRF viewsets' query building
+and the season response cache, but read rows with the async ORM. Anything
+other than a JSON GET (the browsable API, POST) goes to the viewset as is.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .cache import alist_version, aserve_cached, list_cache_key
+from .profiling import serializing
+from .serializers import TeamSerializer
+from .views import LeaderboardViewSet, PlayerViewSet, TeamViewSet
+
+
+def wants_json(request) -> bool:
+    """Whether DRF would answer with JSON rather than the browsable API."""
+    requested = request.GET.get('format')
+    if requested:
+        return requested == 'json'
+    return 'text/html' not in request.headers.get('Accept', '')
+
+
+def async_list_view(viewset, basename: str, actions: dict, render):
+    """Async view for viewset.list(); `render(view)` is a coroutine returning the JSON bytes.
+
+    Entries share response_cache keys with SeasonCacheMixin, so the sync
+    and async routes warm the same cache.
+    """
+    fallback = viewset.as_view(actions, basename=basename)
+
+    async def view(request):
+        if request.method != 'GET' or not wants_json(request):
+            return await sync_to_async(fallback)(request)
+
+        handler = viewset(basename=basename, action='list', args=(), kwargs={}, format_kwarg=None)
+        handler.request = Request(request)
+        season = handler.request.query_params.get('season', handler.default_season)
+        version, updated_at = await alist_version(season)
+        key = list_cache_key(basename, season, version, request)
+
+        async def render_json():
+            with serializing():
+                return await render(handler), 'application/json'
+
+        try:
+            return await aserve_cached(request, key, updated_at, render_json)
+        except APIException as exc:
+            # Same body DRF's exception handler would send.
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            return HttpResponse(JSONRenderer().render(data), status=exc.status_code, content_type='application/json')
+
+    return csrf_exempt(view)
+
+
+async def render_teams(view) -> bytes:
+    teams = [team async for team in view.get_queryset().aiterator()]
+    return JSONRenderer().render(TeamSerializer(teams, many=True).data)
+
+
+async def render_players(view) -> bytes:
+    serializer, queryset, hidden = view.page_query()
+    await view.paginator.acount_rows()
+    return view.render_page(await serializer.arows(queryset), hidden)
+
+
+async def render_leaderboard(view) -> bytes:
+    serializer = view.get_values_serializer()
+    return serializer.dumps(await serializer.arows(view.get_queryset()))
+
+
+teams = async_list_view(TeamViewSet, 'team', {'get': 'list', 'post': 'create'}, render_teams)
+players = async_list_view(PlayerViewSet, 'player', {'get': 'list', 'post': 'create'}, render_players)
+leaderboards = async_list_view(LeaderboardViewSet, 'leaderboard', {'get': 'list'}, render_leaderboard)
@@ -0,0 +1,227 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F, Max, Sum
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .models import SeasonVersion
+from .profiling import serializing
+
+
+class CachedResponse:
+    __slots__ = ('content', 'content_type', 'etag', 'last_modified')
+
+    def __init__(self, content: bytes, content_type: str, last_modified):
+        self.content = content
+        self.content_type = content_type
+        self.etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered responses, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry: CachedResponse):
+        if len(entry.content) > self.max_bytes:
+            return entry
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.content)
+            self.entries[key] = entry
+            self.size += len(entry.content)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted.content)
+                self.evictions += 1
+        return entry
+
+    def record_not_modified(self):
+        with self.lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=getattr(settings, 'SEASON_CACHE_MAX_ENTRIES', 256),
+    max_bytes=getattr(settings, 'SEASON_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+)
+
+
+def season_version(season: str):
+    """Return (version, updated_at) for a season; (0, None) before its first ingest."""
+    row = SeasonVersion.objects.filter(season=season).values_list('version', 'updated_at').first()
+    return row or (0, None)
+
+
+async def aseason_version(season: str):
+    row = await SeasonVersion.objects.filter(season=season).values_list('version', 'updated_at').afirst()
+    return row or (0, None)
+
+
+def list_cache_key(basename: str, season: str, version: int, request) -> tuple:
+    """Key for a season list response: the view, season version and every query parameter.
+
+    Paginated bodies hold absolute next/previous links, so the scheme and
+    host the request came in on are part of the key too.
+    """
+    return (basename, season, version, request.scheme, request.get_host(), tuple(sorted(
+        (name, tuple(values)) for name, values in request.GET.lists()
+    )))
+
+
+def all_seasons_version():
+    """(version, updated_at) that changes whenever any season is bumped."""
+    row = SeasonVersion.objects.aggregate(version=Sum('version'), updated_at=Max('updated_at'))
+    return row['version'] or 0, row['updated_at']
+
+
+async def aall_seasons_version():
+    row = await SeasonVersion.objects.aaggregate(version=Sum('version'), updated_at=Max('updated_at'))
+    return row['version'] or 0, row['updated_at']
+
+
+def list_version(season: str):
+    """Version of a list filtered on `season`; an empty one lists every season."""
+    return season_version(season) if season else all_seasons_version()
+
+
+async def alist_version(season: str):
+    return await aseason_version(season) if season else await aall_seasons_version()
+
+
+def bump_season_version(season: str):
+    """Invalidate every cached response for `season`. Called by get_data after writes."""
+    row, _ = SeasonVersion.objects.get_or_create(season=season)
+    row.version = F('version') + 1
+    row.save(update_fields=['version', 'updated_at'])
+
+
+def serve_cached(request, key, updated_at, render):
+    """Answer `request` from response_cache, calling render() -> (content, content_type) on a miss.
+
+    `key` must change whenever the underlying data does (callers fold in a
+    SeasonVersion). Returns the entry's bytes with ETag/Last-Modified, or a
+    304 when the client's copy is current. A render() returning None is not
+    cached and yields None.
+    """
+    entry = response_cache.get(key)
+    if entry is None:
+        rendered = render()
+        if rendered is None:
+            return None
+        entry = response_cache.set(key, CachedResponse(*rendered, updated_at))
+    return cached_response(request, entry)
+
+
+async def aserve_cached(request, key, updated_at, render):
+    """serve_cached() for async views, where render is a coroutine function."""
+    entry = response_cache.get(key)
+    if entry is None:
+        rendered = await render()
+        if rendered is None:
+            return None
+        entry = response_cache.set(key, CachedResponse(*rendered, updated_at))
+    return cached_response(request, entry)
+
+
+def cached_response(request, entry: CachedResponse):
+    last_modified = int(entry.last_modified.timestamp()) if entry.last_modified else None
+    response = get_conditional_response(request, etag=entry.etag, last_modified=last_modified)
+    if response is not None:
+        response_cache.record_not_modified()
+    else:
+        response = HttpResponse(entry.content, content_type=entry.content_type)
+
+    response['ETag'] = entry.etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+class SeasonCacheMixin:
+    """Serve list() for JSON clients from response_cache.
+
+    Entries are keyed on the view, the season's version (every season's for
+    an empty ?season=), the request's scheme and host and every query
+    parameter, so a bump from get_data makes all of that season's entries
+    unreachable; the LRU bound then evicts them.
+    Responses carry ETag and Last-Modified, and matching conditional requests
+    get a 304.
+    """
+
+    default_season = '2024-25'
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        season = request.query_params.get('season', self.default_season)
+        version, updated_at = list_version(season)
+        key = list_cache_key(self.basename, season, version, request)
+
+        uncached = None
+
+        def render():
+            nonlocal uncached
+            with serializing():
+                response = self.uncached_list(request, *args, **kwargs)
+                if response.status_code != 200:
+                    uncached = response
+                    return None
+                if isinstance(response, Response):
+                    content = request.accepted_renderer.render(
+                        response.data, request.accepted_media_type, self.get_renderer_context()
+                    )
+                else:
+                    content = response.content
+            return content, request.accepted_renderer.media_type
+
+        return serve_cached(request, key, updated_at, render) or uncached
+
+    def uncached_list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from django.db.models import Count, F, Max, Min, Sum
+
+from .metrics import PER90_FIELDS, RATE_FIELDS, VOLUME_FIELDS, json_records
+from .models import Player, PlayerCareer
+
+TOTAL_FIELDS = VOLUME_FIELDS + PER90_FIELDS
+SERIES_FIELDS = [
+    'season', 'team_name', 'position', 'appearances', 'minutesPlayed',
+    'goals', 'assists', 'expectedGoals',
+]
+
+
+def career_frame(player_ids) -> pd.DataFrame:
+    """One GROUP BY player_id row per player: totals and minutes-weighted percentage sums."""
+    aggregates = {
+        'seasons': Count('id'),
+        'first_season': Min('season'),
+        'last_season': Max('season'),
+        **{f'total_{name}': Sum(name) for name in TOTAL_FIELDS},
+        **{f'weighted_{name}': Sum(F(name) * F('minutesPlayed')) for name in RATE_FIELDS},
+    }
+    rows = Player.objects.filter(player_id__in=player_ids).values('player_id').annotate(**aggregates)
+    # Explicit columns so no matching players gives an empty frame, not a KeyError.
+    return pd.DataFrame.from_records(rows, columns=['player_id', *aggregates]).set_index('player_id')
+
+
+def career_series(player_ids) -> dict:
+    """{player_id: [season rows, oldest first]} from a single query."""
+    lookups = ['team__team_name' if name == 'team_name' else name for name in SERIES_FIELDS]
+    series = {}
+    for player_id, name, *values in Player.objects.filter(player_id__in=player_ids).order_by(
+        'player_id', 'season'
+    ).values_list('player_id', 'name', *lookups):
+        series.setdefault(player_id, []).append({'name': name, **dict(zip(SERIES_FIELDS, values))})
+    return series
+
+
+def rebuild_careers(player_ids) -> int:
+    """Recompute PlayerCareer rows for `player_ids` from every season they appear in.
+
+    get_data passes the players of the season it just wrote, so one ingest
+    touches only those careers. Players with no seasons left are removed.
+    """
+    player_ids = list(set(player_ids))
+    if not player_ids:
+        return 0
+
+    df = career_frame(player_ids)
+    PlayerCareer.objects.filter(player_id__in=player_ids).exclude(player_id__in=df.index).delete()
+    if df.empty:
+        return 0
+
+    totals = df[[f'total_{name}' for name in TOTAL_FIELDS]]
+    totals.columns = TOTAL_FIELDS
+    minutes = totals['minutesPlayed'].to_numpy(dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weighted = df[[f'weighted_{name}' for name in RATE_FIELDS]].to_numpy(dtype=float)
+        percentages = pd.DataFrame(
+            weighted / minutes[:, None], index=df.index, columns=RATE_FIELDS
+        ).replace([np.inf, -np.inf], np.nan).round(2)
+        per90 = pd.DataFrame(
+            totals[PER90_FIELDS].to_numpy(dtype=float) / minutes[:, None] * 90,
+            index=df.index, columns=PER90_FIELDS,
+        ).replace([np.inf, -np.inf], np.nan).round(3)
+
+    series = career_series(player_ids)
+    careers = [
+        PlayerCareer(
+            player_id=player_id,
+            name=series[player_id][-1]['name'],
+            first_season=row.first_season,
+            last_season=row.last_season,
+            seasons=row.seasons,
+            totals=total,
+            percentages=percentage,
+            per90=rate,
+            series=[{key: value for key, value in season.items() if key != 'name'}
+                    for season in series[player_id]],
+        )
+        for player_id, row, total, percentage, rate in zip(
+            df.index, df.itertuples(), json_records(totals), json_records(percentages), json_records(per90)
+        )
+    ]
+    PlayerCareer.objects.bulk_create(
+        careers,
+        update_conflicts=True,
+        unique_fields=['player_id'],
+        update_fields=[
+            'name', 'first_season', 'last_season', 'seasons',
+            'totals', 'percentages', 'per90', 'series', 'updated_at',
+        ],
+        batch_size=500,
+    )
+    return len(careers)
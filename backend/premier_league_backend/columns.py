@@ -0,0 +1,267 @@
+import hashlib
+import logging
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# model field -> (CSV column aliases, dtype)
+# Aliases are matched against normalized (stripped, lower-cased) headers and
+# the first one present in the file wins.
+TEAM_COLUMNS = {
+    "team_name": (["team"], str),
+    "matches_played": (["played"], int),
+    "wins": (["won"], int),
+    "draws": (["drawn"], int),
+    "losses": (["lost"], int),
+    "points": (["points"], int),
+    "goals_for": (["gf"], int),
+    "goals_against": (["ga"], int),
+    "goal_difference": (["gd"], int),
+    "rank": (["rank"], int),
+    "manager": (["manager"], str),
+    "captain": (["captain"], str),
+    "stadium": (["stadium"], str),
+    "top_scorer_all_time": (["top_scorer_all_time"], str),
+    "premier_league_titles": (["premier_league_titles"], str),
+    "fa_cup_titles": (["fa_cup_titles"], str),
+    "league_cup_titles": (["league_cup_titles"], str),
+}
+
+PLAYER_COLUMNS = {
+    "player_id": (["player id", "playerid"], str),
+    "name": (["player"], str),
+    "team": (["team"], str),
+    "position": (["position"], str),
+
+    # Basic
+    "appearances": (["appearances"], int),
+    "minutesPlayed": (["minutesplayed", "minutes"], int),
+
+    # Attacking
+    "goals": (["goals"], int),
+    "assists": (["assists"], int),
+    "expectedGoals": (["expectedgoals", "xg"], float),
+    "totalShots": (["totalshots", "shots"], int),
+    "shotsOnTarget": (["shotsontarget"], int),
+    "blockedShots": (["blockedshots"], int),
+    "bigChancesMissed": (["bigchancesmissed"], int),
+    "goalConversionPercentage": (["goalconversionpercentage"], float),
+    "hitWoodwork": (["hitwoodwork"], int),
+    "offsides": (["offsides"], int),
+    "passToAssist": (["passtoassist"], int),
+
+    # Passing
+    "accuratePasses": (["accuratepasses"], int),
+    "accuratePassesPercentage": (["accuratepassespercentage"], float),
+    "keyPasses": (["keypasses"], int),
+    "accurateFinalThirdPasses": (["accuratefinalthirdpasses"], int),
+    "accurateCrosses": (["accuratecrosses"], int),
+    "accurateCrossesPercentage": (["accuratecrossespercentage"], float),
+    "accurateLongBalls": (["accuratelongballs"], int),
+    "accurateLongBallsPercentage": (["accuratelongballspercentage"], float),
+
+    # Duels & Defense
+    "tackles": (["tackles"], int),
+    "interceptions": (["interceptions"], int),
+    "clearances": (["clearances"], int),
+    "dribbledPast": (["dribbledpast"], int),
+    "groundDuelsWon": (["groundduelswon"], int),
+    "groundDuelsWonPercentage": (["groundduelswonpercentage"], float),
+    "aerialDuelsWon": (["aerialduelswon"], int),
+    "aerialDuelsWonPercentage": (["aerialduelswonpercentage"], float),
+    "totalDuelsWon": (["totalduelswon"], int),
+    "totalDuelsWonPercentage": (["totalduelswonpercentage"], float),
+    "successfulDribbles": (["successfuldribbles"], int),
+    "successfulDribblesPercentage": (["successfuldribblespercentage"], float),
+
+    # Discipline
+    "yellowCards": (["yellowcards"], int),
+    "redCards": (["redcards"], int),
+    "fouls": (["fouls"], int),
+    "wasFouled": (["wasfouled"], int),
+    "dispossessed": (["dispossessed"], int),
+
+    # Goalkeeping
+    "saves": (["saves"], int),
+    "savedShotsFromInsideTheBox": (["savedshotsfrominsidethebox"], int),
+    "savedShotsFromOutsideTheBox": (["savedshotsfromoutsidethebox"], int),
+    "goalsConceded": (["goalsconceded"], int),
+    "goalsConcededInsideTheBox": (["goalsconcededinsidethebox"], int),
+    "goalsConcededOutsideTheBox": (["goalsconcededoutsidethebox"], int),
+    "highClaims": (["highclaims"], int),
+    "runsOut": (["runsout"], int),
+    "successfulRunsOut": (["successfulrunsout"], int),
+    "punches": (["punches"], int),
+
+    # Errors
+    "errorLeadToGoal": (["errorleadtogoal"], int),
+    "errorLeadToShot": (["errorleadtoshot"], int),
+}
+
+# Column layout of the combined season CSVs written by scraper.py.
+SCRAPED_COLUMNS = [
+    "goals", "yellowCards", "redCards", "groundDuelsWon", "groundDuelsWonPercentage",
+    "aerialDuelsWon", "aerialDuelsWonPercentage", "successfulDribbles",
+    "successfulDribblesPercentage", "tackles", "assists", "accuratePassesPercentage",
+    "totalDuelsWon", "totalDuelsWonPercentage", "minutesPlayed", "wasFouled", "fouls",
+    "dispossessed", "appearances", "saves", "savedShotsFromInsideTheBox",
+    "savedShotsFromOutsideTheBox", "goalsConceded", "goalsConcededInsideTheBox",
+    "goalsConcededOutsideTheBox", "highClaims", "successfulRunsOut", "punches", "runsOut",
+    "accurateFinalThirdPasses", "bigChancesCreated", "accuratePasses", "keyPasses",
+    "accurateCrosses", "accurateCrossesPercentage", "accurateLongBalls",
+    "accurateLongBallsPercentage", "interceptions", "clearances", "dribbledPast",
+    "bigChancesMissed", "totalShots", "shotsOnTarget", "blockedShots",
+    "goalConversionPercentage", "hitWoodwork", "offsides", "expectedGoals",
+    "errorLeadToGoal", "errorLeadToShot", "passToAssist", "player", "team", "player id",
+    "team id", "position",
+]
+
+# Only the goalkeeper scrape reports these; other positions get 0.
+GOALKEEPER_COLUMNS = ["goalsConcededInsideTheBox", "goalsConcededOutsideTheBox"]
+
+DTYPE_DEFAULTS = {
+    int: 0,
+    float: 0.0,
+    str: "",
+}
+
+ARROW_TYPES = {
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+}
+
+PLAYER_SCHEMA = pa.schema([
+    (field, ARROW_TYPES[dtype]) for field, (_, dtype) in PLAYER_COLUMNS.items()
+])
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = df.columns.str.strip().str.lower()
+    return df
+
+
+def apply_column_map(df: pd.DataFrame, column_map: dict) -> pd.DataFrame:
+    """Return a new frame with one typed column per model field.
+
+    Numeric columns are coerced in one pass each; unparseable or missing
+    values fall back to the dtype default, as the old per-cell helpers did.
+    """
+    columns = {}
+    for field, (aliases, dtype) in column_map.items():
+        source = next((alias for alias in aliases if alias in df.columns), None)
+        default = DTYPE_DEFAULTS[dtype]
+
+        if source is None:
+            columns[field] = pd.Series(default, index=df.index, dtype=object if dtype is str else dtype)
+        elif dtype is str:
+            values = df[source]
+            columns[field] = values.where(values.notna(), default).astype(str)
+        else:
+            columns[field] = pd.to_numeric(df[source], errors="coerce").fillna(default).astype(dtype)
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def combine_position_frames(frames: dict) -> pd.DataFrame:
+    """Stack raw per-position scrape frames into one season frame.
+
+    `frames` maps a position code ("GK", "DF", ...) to its Sofascore frame.
+    The frames are outer-joined in a single concat, which also tags each row
+    with its position, then laid out as SCRAPED_COLUMNS; other columns are
+    dropped with a logged warning. The inputs are not modified.
+    """
+    df = pd.concat(frames, names=["position", None], join="outer").reset_index(level="position")
+    df = df.reset_index(drop=True)
+    # The outer join leaves NaN (and so float64) for outfield rows; cast back
+    # so the CSV keeps writing 10, not 10.0, and its content hash is stable.
+    df[GOALKEEPER_COLUMNS] = df.reindex(columns=GOALKEEPER_COLUMNS).fillna(0).astype("int64")
+    df["goalsConceded"] = df["goalsConcededInsideTheBox"] + df["goalsConcededOutsideTheBox"]
+
+    dropped = df.columns.difference(SCRAPED_COLUMNS)
+    if len(dropped):
+        logger.warning("Dropping scraped columns not in SCRAPED_COLUMNS: %s", ", ".join(dropped))
+    return df.reindex(columns=SCRAPED_COLUMNS)
+
+
+def read_team_csv(csv_path: str) -> pd.DataFrame:
+    return apply_column_map(normalize_columns(pd.read_csv(csv_path)), TEAM_COLUMNS)
+
+
+def read_player_csv(csv_path: str) -> pd.DataFrame:
+    df = apply_column_map(normalize_columns(pd.read_csv(csv_path)), PLAYER_COLUMNS)
+    return df.drop_duplicates(subset="player_id", keep="last")
+
+
+def parquet_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+# Parquet schema metadata key holding the sha256 of the CSV the cache was built from.
+SOURCE_HASH_KEY = b"source_sha256"
+
+
+def content_hash(path: str) -> str:
+    """sha256 of a file's bytes, as recorded in the ingest manifest."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_player_parquet(df: pd.DataFrame, path: str, source_hash: str):
+    table = pa.Table.from_pandas(df, schema=PLAYER_SCHEMA, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), SOURCE_HASH_KEY: source_hash.encode()}
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def parquet_source_hash(path: str):
+    """The CSV hash a Parquet cache was built from, or None if it has none or is unreadable."""
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    source_hash = metadata.get(SOURCE_HASH_KEY)
+    return source_hash.decode() if source_hash else None
+
+
+def read_player_frame(csv_path: str, columns=None, source_hash: str = None) -> pd.DataFrame:
+    """Read a season's typed player frame, preferring the Parquet cache.
+
+    The cache next to the CSV is memory-mapped and only the requested
+    columns are decoded. It is used when it was built from a CSV with the
+    same content hash (pass `source_hash` if it is already known), or when
+    the CSV is gone; otherwise the CSV is parsed and the cache rebuilt.
+    """
+    cache_path = parquet_path(csv_path)
+    if not os.path.exists(csv_path):
+        return pq.read_table(cache_path, columns=columns, memory_map=True).to_pandas()
+
+    if source_hash is None:
+        source_hash = content_hash(csv_path)
+    if parquet_source_hash(cache_path) == source_hash:
+        return pq.read_table(cache_path, columns=columns, memory_map=True).to_pandas()
+
+    df = read_player_csv(csv_path)
+    try:
+        write_player_parquet(df, cache_path, source_hash)
+    except OSError:
+        pass
+    return df[columns] if columns else df
+
+
+def read_season_csvs(team_csv, player_csv, player_hash=None):
+    """Parse one season's team and player CSVs into typed frames.
+
+    Kept free of Django imports so it can run in a worker process. Pass
+    None for a file that should not be read; its frame comes back as None.
+    `player_hash` is the player CSV's content hash, if already computed.
+    """
+    team_df = read_team_csv(team_csv) if team_csv else None
+    player_df = read_player_frame(player_csv, source_hash=player_hash) if player_csv else None
+    return team_df, player_df
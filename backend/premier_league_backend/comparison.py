@@ -0,0 +1,83 @@
+import numpy as np
+from django.db.models import Max, Min, Q
+
+from .models import Player
+
+COMPARISON_METRICS = {
+    'offensive': [
+        'goals', 'assists', 'expectedGoals', 'totalShots', 'shotsOnTarget',
+        'keyPasses', 'successfulDribbles',
+    ],
+    'defensive': ['tackles', 'interceptions', 'clearances', 'totalDuelsWon', 'aerialDuelsWon'],
+    'goalkeeping': ['saves', 'goalsConceded', 'highClaims', 'punches', 'runsOut'],
+}
+PLAYER_FIELDS = ['id', 'player_id', 'name', 'team__team_name', 'position', 'season', 'minutesPlayed']
+
+
+def season_bounds(seasons, metrics) -> dict:
+    """{season: (mins, maxs)} per metric, over players with a non-zero value, in one GROUP BY."""
+    aggregates = {}
+    for index, metric in enumerate(metrics):
+        nonzero = Q(**{f'{metric}__gt': 0})
+        aggregates[f'min_{index}'] = Min(metric, filter=nonzero)
+        aggregates[f'max_{index}'] = Max(metric, filter=nonzero)
+
+    bounds = {}
+    for row in Player.objects.filter(season__in=seasons).values('season').annotate(**aggregates):
+        bounds[row['season']] = (
+            [row[f'min_{index}'] for index in range(len(metrics))],
+            [row[f'max_{index}'] for index in range(len(metrics))],
+        )
+    return bounds
+
+
+def compare_players(ids, kind: str) -> list:
+    """Raw, per-90 and radar (0-100) values for each player in `ids`, in that order.
+
+    Radar scores are min/max normalized against the player's own season,
+    ignoring zeros, the way the comparison radar has always scaled them;
+    50 when every non-zero value in the season is the same and 0 when
+    there are none.
+    """
+    metrics = COMPARISON_METRICS[kind]
+    rows = {
+        row[0]: row
+        for row in Player.objects.filter(id__in=ids).values_list(*PLAYER_FIELDS, *metrics)
+    }
+    rows = [rows[pk] for pk in ids if pk in rows]
+    if not rows:
+        return []
+
+    seasons = [row[5] for row in rows]
+    bounds = season_bounds(set(seasons), metrics)
+    raw = np.array([row[len(PLAYER_FIELDS):] for row in rows], dtype=float)
+    minutes = np.array([row[6] for row in rows], dtype=float)
+    low = np.array([bounds[season][0] for season in seasons], dtype=float)
+    high = np.array([bounds[season][1] for season in seasons], dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per90 = np.where(minutes[:, None] > 0, raw / minutes[:, None] * 90, np.nan)
+        radar = np.where(high > low, (raw - low) / (high - low) * 100, 50.0)
+    radar = np.clip(np.where(np.isnan(high), 0.0, radar), 0, 100)
+
+    def as_dict(values, digits):
+        return {
+            metric: None if np.isnan(value) else round(float(value), digits)
+            for metric, value in zip(metrics, values)
+        }
+
+    return [
+        {
+            'id': row[0],
+            'player_id': row[1],
+            'name': row[2],
+            'team_name': row[3],
+            'position': row[4],
+            'season': row[5],
+            'minutesPlayed': row[6],
+            'raw': dict(zip(metrics, row[len(PLAYER_FIELDS):])),
+            'per90': as_dict(per90[index], 3),
+            'radar': as_dict(radar[index], 1),
+        }
+        for index, row in enumerate(rows)
+    ]
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+
+# Pragmas that need write access; read-only connections inherit the file's setting.
+WRITE_PRAGMAS = {'journal_mode', 'synchronous'}
+
+
+def is_read_only(connection) -> bool:
+    return 'mode=ro' in str(connection.settings_dict['NAME'])
+
+
+def apply_pragmas(cursor, pragmas: dict, read_only: bool = False):
+    for name, value in pragmas.items():
+        if read_only and name in WRITE_PRAGMAS:
+            continue
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created receiver applying settings.SQLITE_PRAGMAS to new SQLite connections.
+
+    These trade durability of the last few commits on power loss
+    (synchronous=NORMAL) and memory for speed. None of them writes to the
+    database file; the journal mode does, so set_journal_mode() handles it.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    cursor = connection.connection.cursor()
+    try:
+        apply_pragmas(cursor, getattr(settings, 'SQLITE_PRAGMAS', {}), is_read_only(connection))
+    finally:
+        cursor.close()
+
+
+def set_journal_mode(using: str = DEFAULT_DB_ALIAS):
+    """Switch the database file to settings.SQLITE_JOURNAL_MODE and return the mode in effect.
+
+    WAL lets readers keep reading the last committed data while get_data
+    holds its write transaction. The mode persists in the file, so get_data
+    sets it once per run; other commands (check, makemigrations, runserver)
+    leave the file alone. Returns None for other databases.
+    """
+    connection = connections[using]
+    mode = getattr(settings, 'SQLITE_JOURNAL_MODE', None)
+    if connection.vendor != 'sqlite' or not mode:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA journal_mode = {mode}')
+        return cursor.fetchone()[0]
+
+
+class ReadReplicaRouter:
+    """Route reads to the read-only REPLICA_DB_ALIAS when it is configured.
+
+    Reads made while the default connection is inside a transaction stay on
+    it, so get_data sees its own uncommitted rows. Writes and migrations
+    always go to the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if REPLICA_DB_ALIAS in connections.settings and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Instances read from the replica are saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DB_ALIAS
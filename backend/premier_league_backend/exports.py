@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+from itertools import islice
+
+import pyarrow as pa
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import models
+
+from .models import Player
+from .serializers import PlayerValuesSerializer
+
+# Rows per cursor fetch and per streamed chunk. Player rows are ~100 columns
+# wide, so this bounds peak memory at a few MB whatever the export size.
+CHUNK_SIZE = 500
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+
+def export_queryset(seasons=None, season_from=None, season_to=None):
+    """Players of the listed seasons and/or an inclusive season range, in (season, player_id) order."""
+    queryset = Player.objects.all()
+    if seasons:
+        queryset = queryset.filter(season__in=seasons)
+    if season_from:
+        queryset = queryset.filter(season__gte=season_from)
+    if season_to:
+        queryset = queryset.filter(season__lte=season_to)
+    # Matches the (season, player_id) unique index, so no sort step.
+    return queryset.order_by('season', 'player_id')
+
+
+def value_chunks(serializer, queryset):
+    """Lists of up to CHUNK_SIZE raw row tuples, read through a chunked cursor."""
+    rows = serializer.values(queryset).iterator(chunk_size=CHUNK_SIZE)
+    while chunk := list(islice(rows, CHUNK_SIZE)):
+        yield chunk
+
+
+def ndjson_chunks(serializer, queryset):
+    names = serializer.names
+    for chunk in value_chunks(serializer, queryset):
+        lines = [
+            json.dumps(dict(zip(names, row)), ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+            for row in serializer.to_tuples(chunk)
+        ]
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+def csv_chunks(serializer, queryset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(serializer.names)
+    for chunk in value_chunks(serializer, queryset):
+        writer.writerows(serializer.to_tuples(chunk))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def arrow_type(name: str):
+    if name == 'team_name':
+        return pa.string()
+    field = Player._meta.get_field(name)
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    if isinstance(field, (models.IntegerField, models.AutoField, models.ForeignKey)):
+        return pa.int64()
+    return pa.string()
+
+
+def arrow_chunks(serializer, queryset):
+    """Arrow IPC stream: the schema, then one record batch per chunk."""
+    schema = pa.schema([(name, arrow_type(name)) for name in serializer.names])
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        for chunk in value_chunks(serializer, queryset):
+            columns = zip(*chunk)
+            writer.write_batch(pa.record_batch(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    # End-of-stream marker written on close.
+    yield sink.getvalue()
+
+
+EXPORT_WRITERS = {'ndjson': ndjson_chunks, 'csv': csv_chunks, 'arrow': arrow_chunks}
+
+
+def export_players(export_format: str, queryset, fields=None):
+    """Byte chunks of `queryset` in `export_format`; only one chunk of rows is in memory at a time."""
+    return EXPORT_WRITERS[export_format](PlayerValuesSerializer(fields), queryset)
+
+
+def streaming_content(request, chunks):
+    """Adapt a sync chunk generator for StreamingHttpResponse.
+
+    Under ASGI, Django reads a sync iterator to the end before sending
+    anything, so there the chunks are pulled one at a time on the request's
+    thread instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return chunks
+
+    async def pull():
+        while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+            yield chunk
+
+    return pull()
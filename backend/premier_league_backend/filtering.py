@@ -0,0 +1,25 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class RangeFilter(BaseFilterBackend):
+    """Numeric range filters such as ?minutesPlayed__gte=900&goals__lt=5.
+
+    Applies to the fields named in the view's `range_fields`; other
+    parameters are ignored.
+    """
+
+    lookups = ('gt', 'gte', 'lt', 'lte')
+
+    def filter_queryset(self, request, queryset, view):
+        fields = getattr(view, 'range_fields', ())
+        filters = {}
+        for param, value in request.query_params.items():
+            name, _, lookup = param.rpartition('__')
+            if name not in fields or lookup not in self.lookups:
+                continue
+            try:
+                filters[param] = float(value)
+            except ValueError:
+                raise ValidationError({param: 'Must be a number.'})
+        return queryset.filter(**filters)
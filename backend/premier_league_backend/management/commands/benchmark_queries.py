@@ -0,0 +1,108 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from premier_league_backend.models import Team, Player
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a synthetic multi-season dataset inside a transaction, then show "
+        "EXPLAIN QUERY PLAN and timings for the API's query shapes with and "
+        "without the season indexes. Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seasons", type=int, default=50)
+        parser.add_argument("--teams", type=int, default=20)
+        parser.add_argument("--players", type=int, default=600, help="Players per season.")
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def load_synthetic(self, seasons: int, teams: int, players: int):
+        for n in range(seasons):
+            season = f"S{n:04d}"
+            team_objs = Team.objects.bulk_create([
+                Team(season=season, team_name=f"Team {t}", rank=t + 1, points=100 - t)
+                for t in range(teams)
+            ])
+            Player.objects.bulk_create([
+                Player(
+                    season=season,
+                    player_id=str(p),
+                    name=f"Player {p}",
+                    team=team_objs[p % teams],
+                    position="MF",
+                    goals=(p * 7919) % 31,
+                    minutesPlayed=(p * 104729) % 3420,
+                )
+                for p in range(players)
+            ], batch_size=500)
+        return f"S{seasons // 2:04d}", team_objs[0]
+
+    def query_shapes(self, season: str, team: Team):
+        return {
+            "players by season, -goals": Player.objects.filter(season=season).order_by("-goals"),
+            "teams by season, rank": Team.objects.filter(season=season).order_by("rank"),
+            "players by season, team": Player.objects.filter(season=season, team=team),
+        }
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def time_query(self, queryset, repeat: int) -> float:
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                cursor.execute(sql, params)
+                cursor.fetchall()
+        return (time.perf_counter() - started) / repeat * 1000
+
+    def report(self, label: str, shapes: dict, repeat: int):
+        self.stdout.write(self.style.WARNING(f"\n{label}"))
+        for name, queryset in shapes.items():
+            self.stdout.write(f"  {name}: {self.time_query(queryset, repeat):.3f} ms")
+            for line in self.explain(queryset):
+                self.stdout.write(f"      {line}")
+
+    def handle(self, *args, **options):
+        indexes = [(model, index) for model in (Team, Player) for index in model._meta.indexes]
+
+        try:
+            with transaction.atomic():
+                self.stdout.write(
+                    f"Loading {options['seasons']} synthetic seasons "
+                    f"x {options['players']} players..."
+                )
+                season, team = self.load_synthetic(
+                    options["seasons"], options["teams"], options["players"]
+                )
+                shapes = self.query_shapes(season, team)
+
+                # The SQLite schema editor refuses to run inside atomic(), so
+                # issue the index DDL directly; it is still rolled back.
+                editor = connection.schema_editor()
+                with connection.cursor() as cursor:
+                    for model, index in indexes:
+                        cursor.execute(f"DROP INDEX {editor.quote_name(index.name)}")
+                    cursor.execute("ANALYZE")
+                self.report("Before (unique_together only)", shapes, options["repeat"])
+
+                with connection.cursor() as cursor:
+                    for model, index in indexes:
+                        cursor.execute(str(index.create_sql(model, editor)))
+                    cursor.execute("ANALYZE")
+                self.report("After (season indexes)", shapes, options["repeat"])
+
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS("\nSynthetic data rolled back."))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from premier_league_backend.models import Player
+from premier_league_backend.serializers import PlayerSerializer, PlayerValuesSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare PlayerSerializer + JSONRenderer with the PlayerValuesSerializer "
+        "fast path for a season's players list, and check the bytes match."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--season", type=str, default="2024-25")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def time_render(self, render, repeat: int):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            content = render()
+        return (time.perf_counter() - started) / repeat * 1000, content
+
+    def handle(self, *args, **options):
+        queryset = Player.objects.select_related("team").filter(
+            season=options["season"]
+        ).order_by("-goals")
+        renderer = JSONRenderer()
+
+        serializer_ms, expected = self.time_render(
+            lambda: renderer.render(PlayerSerializer(queryset.all(), many=True).data),
+            options["repeat"],
+        )
+        values_ms, actual = self.time_render(
+            lambda: PlayerValuesSerializer().render(queryset.all()),
+            options["repeat"],
+        )
+
+        self.stdout.write(f"Players: {queryset.count()}, payload: {len(expected):,} bytes")
+        self.stdout.write(f"  PlayerSerializer:       {serializer_ms:8.2f} ms")
+        self.stdout.write(f"  PlayerValuesSerializer: {values_ms:8.2f} ms")
+        self.stdout.write(f"  Speed-up: {serializer_ms / values_ms:.1f}x")
+
+        if actual == expected:
+            self.stdout.write(self.style.SUCCESS("Output is byte-identical."))
+        else:
+            self.stderr.write("Output differs from PlayerSerializer!")
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from premier_league_backend.db import apply_pragmas
+
+# The list endpoints' query shapes.
+READ_QUERIES = [
+    "SELECT p.*, t.team_name FROM api_player p JOIN api_team t ON t.id = p.team_id "
+    "WHERE p.season = ? ORDER BY p.goals DESC, p.player_id LIMIT 50",
+    "SELECT * FROM api_team WHERE season = ? ORDER BY rank",
+]
+# A full re-ingest rewrites every player row inside one transaction.
+WRITE_QUERY = "UPDATE api_player SET minutesPlayed = minutesPlayed"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure read latency from concurrent readers while a get_data-sized "
+        "write transaction runs in a loop, once with SQLite's defaults and once "
+        "with SQLITE_PRAGMAS and SQLITE_JOURNAL_MODE (WAL). Works on temporary "
+        "copies of the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--season", type=str, default="2024-25")
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase.")
+        parser.add_argument(
+            "--hold", type=float, default=0.5,
+            help="Seconds each write transaction stays open after its writes, like "
+                 "get_data rebuilding metrics before it commits.",
+        )
+
+    def reader(self, path, pragmas, season, stop, latencies, errors):
+        connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        apply_pragmas(connection.cursor(), pragmas, read_only=True)
+        index = 0
+        while not stop.is_set():
+            query = READ_QUERIES[index % len(READ_QUERIES)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                connection.execute(query, [season]).fetchall()
+            except sqlite3.OperationalError:
+                errors.append(1)
+                continue
+            latencies.append(time.perf_counter() - started)
+        connection.close()
+
+    def run_phase(self, path, pragmas, options, write: bool):
+        stop = threading.Event()
+        latencies, errors = [], []
+        threads = [
+            threading.Thread(
+                target=self.reader,
+                args=(path, pragmas, options["season"], stop, latencies, errors),
+            )
+            for _ in range(options["readers"])
+        ]
+        for thread in threads:
+            thread.start()
+
+        commits = 0
+        deadline = time.perf_counter() + options["duration"]
+        if write:
+            writer = sqlite3.connect(path, timeout=30, isolation_level=None)
+            apply_pragmas(writer.cursor(), pragmas)
+            while time.perf_counter() < deadline:
+                writer.execute("BEGIN IMMEDIATE")
+                writer.execute(WRITE_QUERY)
+                time.sleep(options["hold"])
+                writer.execute("COMMIT")
+                commits += 1
+            writer.close()
+        else:
+            time.sleep(options["duration"])
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return sorted(latencies), len(errors), commits
+
+    def report(self, label, latencies, errors, commits):
+        def percentile(p):
+            if not latencies:
+                return float("nan")
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        self.stdout.write(
+            f"  {label:<14} {len(latencies):>8,} reads  p50 {percentile(50):7.2f} ms  "
+            f"p99 {percentile(99):8.2f} ms  max {percentile(100):8.2f} ms  "
+            f"errors {errors}" + (f"  commits {commits}" if commits else "")
+        )
+
+    def handle(self, *args, **options):
+        name = str(connections["default"].settings_dict["NAME"])
+        source = sqlite3.connect(name)
+        modes = [
+            ("SQLite defaults", {"journal_mode": "delete"}),
+            ("SQLITE_PRAGMAS", {**settings.SQLITE_PRAGMAS, "journal_mode": settings.SQLITE_JOURNAL_MODE}),
+        ]
+        # Next to the database, so the copies live on the same disk.
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(name))) as tmp:
+            for n, (label, pragmas) in enumerate(modes):
+                path = os.path.join(tmp, f"bench{n}.sqlite3")
+                copy = sqlite3.connect(path)
+                source.backup(copy)
+                copy.execute(f"PRAGMA journal_mode = {pragmas.get('journal_mode', 'delete')}")
+                copy.close()
+
+                self.stdout.write(f"{label}: {options['readers']} readers")
+                self.report("idle", *self.run_phase(path, pragmas, options, write=False))
+                self.report("during ingest", *self.run_phase(path, pragmas, options, write=True))
+        source.close()
@@ -1,7 +1,21 @@
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 from django.core.management.base import BaseCommand
-from premier_league_backend.models import Team, Player
+from django.db import OperationalError, transaction
+from premier_league_backend.aggregates import rebuild_team_aggregates
+from premier_league_backend.cache import bump_season_version
+from premier_league_backend.careers import rebuild_careers
+from premier_league_backend.columns import PLAYER_COLUMNS, content_hash, read_season_csvs
+from premier_league_backend.db import set_journal_mode
+from premier_league_backend.metrics import rebuild_player_metrics
+from premier_league_backend.models import (
+    IngestManifest, Player, PlayerCareer, PlayerMetrics, Team, TeamAggregate,
+)
+from premier_league_backend.search import rebuild_search_index
+from premier_league_backend.similarity import index_path, write_similarity_index
+from premier_league_backend.snapshots import snapshot_path, write_snapshot
 
 
 TEAM_LOGOS = {
@@ -42,6 +56,63 @@ TEAM_LOGOS = {
 
 }
 
+PLAYER_UNIQUE_FIELDS = ["season", "player_id"]
+# Only the columns the ingest sets (plus auto_now updated_at), so an upsert
+# never resets a column it doesn't fill, like team_id_external.
+PLAYER_UPDATE_FIELDS = [
+    "team_id" if field == "team" else field
+    for field in PLAYER_COLUMNS
+    if field not in PLAYER_UNIQUE_FIELDS
+] + ["updated_at"]
+
+
+DATA_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../../../../backend/data/processed")
+)
+
+SEASON_FILES = {
+    "2015-16": {
+        "team": "TEAM_15_16.csv",
+        "player": "EPL_15_16.csv",
+    },
+    "2016-17": {
+        "team": "TEAM_16_17.csv",
+        "player": "EPL_16_17.csv",
+    },
+    "2017-18": {
+        "team": "TEAM_17_18.csv",
+        "player": "EPL_17_18.csv",
+    },
+    "2018-19": {
+        "team": "TEAM_18_19.csv",
+        "player": "EPL_18_19.csv",
+    },
+    "2019-20": {
+        "team": "TEAM_19_20.csv",
+        "player": "EPL_19_20.csv",
+    },
+    "2020-21": {
+        "team": "TEAM_20_21.csv",
+        "player": "EPL_20_21.csv",
+    },
+    "2021-22": {
+        "team": "TEAM_21_22.csv",
+        "player": "EPL_21_22.csv",
+    },
+    "2022-23": {
+        "team": "TEAM_22_23.csv",
+        "player": "EPL_22_23.csv",
+    },
+    "2023-24": {
+        "team": "TEAM_23_24.csv",
+        "player": "EPL_23_24.csv",
+    },
+    "2024-25": {
+        "team": "TEAM_24_25.csv",
+        "player": "EPL_24_25.csv",
+    },
+}
+
 
 class Command(BaseCommand):
     def add_arguments(self, parser):
@@ -53,219 +124,179 @@ class Command(BaseCommand):
             "--clear",
             action="store_true",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-ingest season files and rebuild their derived data even if unchanged since the last run.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Parse season CSVs in this many processes (writes stay single-threaded).",
+        )
 
     def get_logo_url(self, team_name: str) -> str:
         return TEAM_LOGOS.get(team_name, "")
 
-    def normalize_df(self, df: pd.DataFrame) -> pd.DataFrame:
-        df.columns = df.columns.str.strip().str.lower()
-        return df
-    
-    def safe_int(self, value, default=0):
-        try:
-            return int(value) if pd.notna(value) and value != '' else default
-        except (ValueError, TypeError):
-            return default
-    
-    def safe_float(self, value, default=0.0):
-        try:
-            return float(value) if pd.notna(value) and value != '' else default
-        except (ValueError, TypeError):
-            return default
+    def file_fingerprint(self, path: str):
+        return content_hash(path), os.path.getsize(path)
+
+    def changed_files(self, season: str, manifests: dict, force: bool = False) -> dict:
+        """Return {"team"/"player": (path, fingerprint)} for files that need ingesting."""
+        changed = {}
+        for kind in ("team", "player"):
+            file_name = SEASON_FILES[season][kind]
+            path = os.path.join(DATA_DIR, file_name)
+            if not os.path.exists(path):
+                self.stderr.write(f"{kind.title()} CSV not found: {path}")
+                continue
+
+            fingerprint = self.file_fingerprint(path)
+            manifest = manifests.get(file_name)
+            if not force and manifest and (manifest.content_hash, manifest.size) == fingerprint:
+                continue
+            changed[kind] = (path, fingerprint)
+        return changed
+
+    def load_seasons(self, plans: dict, workers: int):
+        """Yield (season, team_df, player_df) in season order.
 
-    def ingest_team_stats(self, csv_path: str, season: str):
-        if not os.path.exists(csv_path):
-            self.stderr.write(f"Team CSV not found: {csv_path}")
+        Only the files listed in each season's plan are parsed. With more
+        than one worker every season is parsed up front in a process pool
+        while this process writes results as they arrive.
+        """
+        def read_args(season):
+            plan = plans[season]
+            # The player CSV's hash also keys its Parquet cache.
+            player_hash = plan["player"][1][0] if "player" in plan else None
+            return tuple(
+                plan[kind][0] if kind in plan else None
+                for kind in ("team", "player")
+            ) + (player_hash,)
+
+        if workers <= 1:
+            for season in plans:
+                yield (season, *read_season_csvs(*read_args(season)))
             return
 
-        self.stdout.write(f"Reading team stats from {csv_path}")
-        df = self.normalize_df(pd.read_csv(csv_path))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                (season, pool.submit(read_season_csvs, *read_args(season)))
+                for season in plans
+            ]
+            for season, future in futures:
+                yield (season, *future.result())
+
+    def record_manifest(self, season: str, path: str, fingerprint, row_count: int):
+        content_hash, size = fingerprint
+        IngestManifest.objects.update_or_create(
+            file_name=os.path.basename(path),
+            defaults={
+                "season": season,
+                "content_hash": content_hash,
+                "size": size,
+                "row_count": row_count,
+            },
+        )
+
+    def changed_players(self, df: pd.DataFrame, season: str) -> pd.DataFrame:
+        """Drop rows whose values already match what is stored for the season."""
+        fields = ["team__team_name" if column == "team" else column for column in df.columns]
+        existing = pd.DataFrame.from_records(
+            Player.objects.filter(season=season).values_list(*fields),
+            columns=list(df.columns),
+        )
+        if existing.empty:
+            return df
+
+        incoming = df.set_index("player_id")
+        existing = existing.set_index("player_id").reindex(incoming.index)[incoming.columns]
+        return df[incoming.ne(existing).any(axis=1).to_numpy()]
+
+    def ingest_team_stats(self, df: pd.DataFrame, season: str) -> int:
+        """Write the teams whose values changed; returns how many were written."""
+        existing = {
+            team["team_name"]: team
+            for team in Team.objects.filter(season=season).values(*df.columns, "logo_url")
+        }
 
-        for _, row in df.iterrows():
-            team_name = row["team"]
+        written = 0
+        for row in df.to_dict("records"):
+            team_name = row["team_name"]
+            row["logo_url"] = self.get_logo_url(team_name)
+            if existing.get(team_name) == row:
+                continue
+            del row["team_name"]
 
             Team.objects.update_or_create(
                 season=season,
                 team_name=team_name,
-                defaults={
-                    "logo_url": self.get_logo_url(team_name),
-                    "matches_played": self.safe_int(row.get("played")),
-                    "wins": self.safe_int(row.get("won")),
-                    "draws": self.safe_int(row.get("drawn")),
-                    "losses": self.safe_int(row.get("lost")),
-                    "points": self.safe_int(row.get("points")),
-                    "goals_for": self.safe_int(row.get("gf")),
-                    "goals_against": self.safe_int(row.get("ga")),
-                    "goal_difference": self.safe_int(row.get("gd")),
-                    "rank": self.safe_int(row.get("rank")),
-                    "manager": row.get("manager", ""),
-                    "captain": row.get("captain", ""),
-                    "stadium": row.get("stadium", ""),
-                    "top_scorer_all_time": row.get("top_scorer_all_time", ""),
-                    "premier_league_titles": row.get("premier_league_titles", ""),
-                    "fa_cup_titles": row.get("fa_cup_titles", ""),
-                    "league_cup_titles": row.get("league_cup_titles", ""),
-                    "xg_for": 0.0,
-                }
+                defaults=row,
             )
+            written += 1
 
             self.stdout.write(f"Ingested data for: {team_name}")
 
         self.stdout.write(self.style.SUCCESS(
-            f"Ingested {len(df)} teams for {season}"
+            f"Ingested {written} changed of {len(df)} teams for {season}"
         ))
+        return written
 
-    def ingest_player_stats(self, csv_path: str, season: str):
-        if not os.path.exists(csv_path):
-            self.stderr.write(f"Player CSV not found: {csv_path}")
-            return
+    def ingest_player_stats(self, df: pd.DataFrame, season: str, diff: bool = True) -> int:
+        started = time.perf_counter()
+        total = len(df)
+        if diff:
+            df = self.changed_players(df, season)
 
-        self.stdout.write(f"Reading player stats from {csv_path}...")
-        df = self.normalize_df(pd.read_csv(csv_path))
-        
-        self.stdout.write(f"CSV Columns: {list(df.columns)}")
+        # One query for the whole season instead of one Team lookup per row.
+        teams = {team.team_name: team for team in Team.objects.filter(season=season)}
 
-        for _, row in df.iterrows():
-            try:
-                team = Team.objects.get(season=season, team_name=row["team"])
-            except Team.DoesNotExist:
+        players = []
+        for row in df.to_dict("records"):
+            team = teams.get(row["team"])
+            if team is None:
                 self.stderr.write(f"Team not found: {row['team']}")
                 continue
 
-            player = Player.objects.update_or_create(
-                season=season,
-                player_id=str(row.get("player id", row.get("playerid", ""))),
-                defaults={
-                    "name": row.get("player", ""),
-                    "team": team,
-                    "position": row.get("position", ""),
-                    
-                    # Basic
-                    "appearances": self.safe_int(row.get("appearances")),
-                    "minutesPlayed": self.safe_int(row.get("minutesplayed", row.get("minutes"))),
-                    
-                    # Attacking
-                    "goals": self.safe_int(row.get("goals")),
-                    "assists": self.safe_int(row.get("assists")),
-                    "expectedGoals": self.safe_float(row.get("expectedgoals", row.get("xg"))),
-                    "totalShots": self.safe_int(row.get("totalshots", row.get("shots"))),
-                    "shotsOnTarget": self.safe_int(row.get("shotsontarget")),
-                    "blockedShots": self.safe_int(row.get("blockedshots")),
-                    "bigChancesMissed": self.safe_int(row.get("bigchancesmissed")),
-                    "goalConversionPercentage": self.safe_float(row.get("goalconversionpercentage")),
-                    "hitWoodwork": self.safe_int(row.get("hitwoodwork")),
-                    "offsides": self.safe_int(row.get("offsides")),
-                    "passToAssist": self.safe_int(row.get("passtoassist")),
-                    
-                    # Passing
-                    "accuratePasses": self.safe_int(row.get("accuratepasses")),
-                    "accuratePassesPercentage": self.safe_float(row.get("accuratepassespercentage")),
-                    "keyPasses": self.safe_int(row.get("keypasses")),
-                    "accurateFinalThirdPasses": self.safe_int(row.get("accuratefinalthirdpasses")),
-                    "accurateCrosses": self.safe_int(row.get("accuratecrosses")),
-                    "accurateCrossesPercentage": self.safe_float(row.get("accuratecrossespercentage")),
-                    "accurateLongBalls": self.safe_int(row.get("accuratelongballs")),
-                    "accurateLongBallsPercentage": self.safe_float(row.get("accuratelongballspercentage")),
-                    
-                    # Duels & Defense
-                    "tackles": self.safe_int(row.get("tackles")),
-                    "interceptions": self.safe_int(row.get("interceptions")),
-                    "clearances": self.safe_int(row.get("clearances")),
-                    "dribbledPast": self.safe_int(row.get("dribbledpast")),
-                    "groundDuelsWon": self.safe_int(row.get("groundduelswon")),
-                    "groundDuelsWonPercentage": self.safe_float(row.get("groundduelswonpercentage")),
-                    "aerialDuelsWon": self.safe_int(row.get("aerialduelswon")),
-                    "aerialDuelsWonPercentage": self.safe_float(row.get("aerialduelswonpercentage")),
-                    "totalDuelsWon": self.safe_int(row.get("totalduelswon")),
-                    "totalDuelsWonPercentage": self.safe_float(row.get("totalduelswonpercentage")),
-                    "successfulDribbles": self.safe_int(row.get("successfuldribbles")),
-                    "successfulDribblesPercentage": self.safe_float(row.get("successfuldribblespercentage")),
-                    
-                    # Discipline
-                    "yellowCards": self.safe_int(row.get("yellowcards")),
-                    "redCards": self.safe_int(row.get("redcards")),
-                    "fouls": self.safe_int(row.get("fouls")),
-                    "wasFouled": self.safe_int(row.get("wasfouled")),
-                    "dispossessed": self.safe_int(row.get("dispossessed")),
-                    
-                    # Goalkeeping - FIXED FIELD NAMES
-                    "saves": self.safe_int(row.get("saves")),
-                    "savedShotsFromInsideTheBox": self.safe_int(row.get("savedshotsfrominsidethebox")),
-                    "savedShotsFromOutsideTheBox": self.safe_int(row.get("savedshotsfromoutsidethebox")),
-                    "goalsConceded": self.safe_int(row.get("goalsconceded")),
-                    "goalsConcededInsideTheBox": self.safe_int(row.get("goalsconcededinsidethebox")),
-                    "goalsConcededOutsideTheBox": self.safe_int(row.get("goalsconcededoutsidethebox")),
-                    "highClaims": self.safe_int(row.get("highclaims")),
-                    "runsOut": self.safe_int(row.get("runsout")),
-                    "successfulRunsOut": self.safe_int(row.get("successfulrunsout")),
-                    "punches": self.safe_int(row.get("punches")),
-                    
-                    # Errors
-                    "errorLeadToGoal": self.safe_int(row.get("errorleadtogoal")),
-                    "errorLeadToShot": self.safe_int(row.get("errorleadtoshot")),
-                }
-            )
-            
-        self.stdout.write(self.style.SUCCESS(
-            f"Ingested {len(df)} players for {season}."
-        ))
+            row["team"] = team
+            players.append(Player(season=season, **row))
 
-    def ingest_season(self, season: str, clear: bool = False):
-        data_dir = os.path.abspath(
-            os.path.join(os.path.dirname(__file__), "../../../../backend/data/processed")
+        Player.objects.bulk_create(
+            players,
+            update_conflicts=True,
+            unique_fields=PLAYER_UNIQUE_FIELDS,
+            update_fields=PLAYER_UPDATE_FIELDS,
         )
 
-        season_files = {
-            "2015-16": {
-                "team": "TEAM_15_16.csv",
-                "player": "EPL_15_16.csv",
-            },
-
-            "2016-17": {
-                "team": "TEAM_16_17.csv",
-                "player": "EPL_16_17.csv",
-            },
-
-            
-            "2017-18": {
-                "team": "TEAM_17_18.csv",
-                "player": "EPL_17_18.csv",
-            },
+        elapsed = time.perf_counter() - started
+        rate = len(players) / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {len(players)} changed of {total} players for {season} "
+            f"in {elapsed:.2f}s ({rate:,.0f} rows/sec)."
+        ))
+        return len(players)
 
-            "2019-20": {
-                "team": "TEAM_19_20.csv",
-                "player": "EPL_19_20.csv",
-            },
-            "2018-19": {
-                "team": "TEAM_18_19.csv",
-                "player": "EPL_18_19.csv",
-            },
+    def derived_missing(self, season: str) -> bool:
+        """Whether the season has players but no metrics, aggregates or careers.
 
-            "2020-21": {
-                "team": "TEAM_20_21.csv",
-                "player": "EPL_20_21.csv",
-            },
-            "2021-22": {
-                "team": "TEAM_21_22.csv",
-                "player": "EPL_21_22.csv",
-            },
-            "2022-23":{
-                "team": "TEAM_22_23.csv",
-                "player": "EPL_22_23.csv",
-            },
-            "2023-24": {
-                "team": "TEAM_23_24.csv",
-                "player": "EPL_23_24.csv",
-            },
-            "2024-25": {
-                "team": "TEAM_24_25.csv",
-                "player": "EPL_24_25.csv",
-            },
-        }
+        True after a migration adds a derived table, or if a run stopped
+        before its derived stages, so the next run fills them in.
+        """
+        players = Player.objects.filter(season=season)
+        if not players.exists():
+            return False
+        return not (
+            PlayerMetrics.objects.filter(season=season).exists()
+            and TeamAggregate.objects.filter(team__season=season).exists()
+            and PlayerCareer.objects.filter(player_id__in=players.values("player_id")).exists()
+        )
 
-        if season not in season_files:
-            self.stderr.write(f"Unknown season: {season}")
-            return
+    @transaction.atomic
+    def ingest_season(self, season: str, plan: dict, team_df, player_df,
+                      clear: bool = False, force: bool = False) -> int:
+        # Careers of players dropped by --clear need rebuilding too.
+        previous_ids = set(Player.objects.filter(season=season).values_list("player_id", flat=True))
 
         if clear:
             self.stdout.write(self.style.WARNING(f"Clearing existing data for {season}..."))
@@ -277,26 +308,96 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING(f"INGESTING SEASON: {season}"))
         self.stdout.write(self.style.WARNING(f"{'=' * 60}\n"))
 
-        self.ingest_team_stats(
-            os.path.join(data_dir, season_files[season]["team"]),
-            season,
-        )
+        teams_written = 0
+        if team_df is None:
+            self.stdout.write("Team stats unchanged, skipping.")
+        else:
+            team_csv, fingerprint = plan["team"]
+            self.stdout.write(f"Read team stats from {team_csv}")
+            teams_written = self.ingest_team_stats(team_df, season)
+            self.record_manifest(season, team_csv, fingerprint, len(team_df))
 
-        self.ingest_player_stats(
-            os.path.join(data_dir, season_files[season]["player"]),
-            season,
-        )
+        ingested = 0
+        if player_df is None:
+            self.stdout.write("Player stats unchanged, skipping.")
+        else:
+            player_csv, fingerprint = plan["player"]
+            self.stdout.write(f"Read player stats from {player_csv}")
+            ingested = self.ingest_player_stats(player_df, season, diff=not clear)
+            self.record_manifest(season, player_csv, fingerprint, len(player_df))
+
+        # Derived data, cached responses and the on-disk snapshot and index
+        # only need rebuilding if a row was written (or removed by --clear),
+        # unless --force asks for it or a previous run never built them.
+        rebuild = bool(ingested or clear or force or self.derived_missing(season))
+        if rebuild:
+            # Percentiles depend on the whole season, so rebuild it all.
+            metrics = rebuild_player_metrics(season)
+            self.stdout.write(f"Rebuilt per-90 and percentile metrics for {metrics} players.")
+            rebuild_search_index(season)
+            incoming_ids = set(player_df["player_id"]) if player_df is not None else set()
+            careers = rebuild_careers(previous_ids | incoming_ids)
+            self.stdout.write(f"Rebuilt {careers} career rollups.")
+
+        if teams_written or rebuild:
+            # xg_for and the team cards' figures come from the season's player rows.
+            teams = rebuild_team_aggregates(season)
+            self.stdout.write(f"Rebuilt aggregates for {teams} teams.")
+
+            bump_season_version(season)
+            transaction.on_commit(lambda: write_snapshot(season))
+            if rebuild:
+                transaction.on_commit(lambda: write_similarity_index(season))
+        else:
+            self.stdout.write("No rows changed; caches and derived data left as they are.")
+            # Requests never write the snapshot or index, so fill in missing ones.
+            if not os.path.exists(snapshot_path(season)):
+                transaction.on_commit(lambda: write_snapshot(season))
+            if not os.path.exists(index_path(season)):
+                transaction.on_commit(lambda: write_similarity_index(season))
 
         self.stdout.write(self.style.SUCCESS(
             f"\n✓ Season {season} ingestion complete!\n"
         ))
-
+        return ingested
 
     def handle(self, *args, **options):
         clear = options.get("clear", False)
-        
+        force = options.get("force", False) or clear
+        started = time.perf_counter()
+
         if options.get("season"):
-            self.ingest_season(options["season"], clear=clear)
+            if options["season"] not in SEASON_FILES:
+                self.stderr.write(f"Unknown season: {options['season']}")
+                return
+            seasons = [options["season"]]
         else:
-            for season in ["2015-16", "2016-17","2017-18","2018-19", "2019-20", "2020-21", "2021-22", "2022-23", "2023-24", "2024-25"]:
-                self.ingest_season(season, clear=clear)
\ No newline at end of file
+            seasons = list(SEASON_FILES)
+
+        try:
+            set_journal_mode()
+        except OperationalError as exc:
+            # Switching to WAL needs the file to itself; retry on the next run.
+            self.stderr.write(f"Could not set the SQLite journal mode: {exc}")
+
+        manifests = {manifest.file_name: manifest for manifest in IngestManifest.objects.all()}
+        plans = {}
+        for season in seasons:
+            plan = self.changed_files(season, manifests, force=force)
+            if plan:
+                plans[season] = plan
+            elif self.derived_missing(season):
+                self.stdout.write(f"Season {season} unchanged, but its derived data is missing; rebuilding it.")
+                plans[season] = plan
+            else:
+                self.stdout.write(f"Season {season} unchanged since last ingest, skipping.")
+
+        ingested = 0
+        for season, team_df, player_df in self.load_seasons(plans, options["workers"]):
+            ingested += self.ingest_season(season, plans[season], team_df, player_df, clear=clear, force=force)
+
+        elapsed = time.perf_counter() - started
+        rate = ingested / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {ingested} players in {elapsed:.2f}s ({rate:,.0f} rows/sec)."
+        ))
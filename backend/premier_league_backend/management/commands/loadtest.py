@@ -0,0 +1,102 @@
+import http.client
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+# What a dashboard client fetches on load: standings, the first players page
+# and the overview leaderboards.
+DEFAULT_PATHS = [
+    "/api/teams/?season={season}",
+    "/api/players/?season={season}",
+    "/api/players/?season={season}&ordering=-assists&page_size=25",
+    "/api/leaderboards/?season={season}&metric=goals&limit=10",
+    "/api/leaderboards/?season={season}&metric=assists&limit=10",
+    "/api/leaderboards/?season={season}&metric=goal_contributions&limit=10",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a running server (runserver or uvicorn, see README) with "
+        "concurrent keep-alive clients cycling through the dashboard's read "
+        "endpoints, then report throughput and latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", type=str, default="http://127.0.0.1:8000")
+        parser.add_argument("--season", type=str, default="2024-25")
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run for.")
+        parser.add_argument(
+            "--path", action="append", dest="paths",
+            help="Request path (repeatable); defaults to the dashboard mix.",
+        )
+
+    def client(self, target, paths, deadline, latencies, statuses, lock):
+        connection_class = http.client.HTTPSConnection if target.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(target.netloc, timeout=30)
+        headers = {"Accept": "application/json"}
+        mine, codes = [], Counter()
+        index = 0
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                codes[response.status] += 1
+            except (OSError, http.client.HTTPException) as exc:
+                codes[type(exc).__name__] += 1
+                connection.close()
+                continue
+            mine.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            latencies.extend(mine)
+            statuses.update(codes)
+
+    def handle(self, *args, **options):
+        target = urlsplit(options["url"])
+        if target.scheme not in ("http", "https") or not target.netloc:
+            raise CommandError(f"Not an http(s) URL: {options['url']}")
+        paths = [
+            path.format(season=options["season"])
+            for path in options["paths"] or DEFAULT_PATHS
+        ]
+
+        latencies, statuses, lock = [], Counter(), threading.Lock()
+        started = time.perf_counter()
+        deadline = started + options["duration"]
+        threads = [
+            threading.Thread(target=self.client, args=(target, paths, deadline, latencies, statuses, lock))
+            for _ in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if not latencies:
+            raise CommandError(f"No request succeeded: {dict(statuses)}")
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        self.stdout.write(
+            f"{len(latencies):,} requests from {options['concurrency']} clients "
+            f"in {elapsed:.1f}s: {len(latencies) / elapsed:,.0f} req/s"
+        )
+        self.stdout.write(
+            f"  latency p50 {percentile(50):.1f} ms, p90 {percentile(90):.1f} ms, "
+            f"p99 {percentile(99):.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+        )
+        self.stdout.write(f"  responses: {dict(sorted(statuses.items(), key=str))}")
+        if any(status != 200 for status in statuses):
+            self.stderr.write("Some requests did not return 200.")
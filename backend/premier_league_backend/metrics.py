@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from django.db import models
+
+from .models import Player, PlayerMetrics
+
+# Below this many minutes per-90 rates are mostly noise, so those players get
+# no rates and are left out of the percentile pools.
+MIN_MINUTES = 90
+
+STAT_FIELDS = [
+    field.name for field in Player._meta.concrete_fields
+    if isinstance(field, (models.IntegerField, models.FloatField)) and not field.primary_key
+]
+# Already rates, ranked as stored rather than per 90.
+RATE_FIELDS = [name for name in STAT_FIELDS if name.endswith('Percentage')]
+VOLUME_FIELDS = ['appearances', 'minutesPlayed']
+PER90_FIELDS = [name for name in STAT_FIELDS if name not in RATE_FIELDS + VOLUME_FIELDS]
+# Stats where less is better: the fewest per 90 gets the highest percentile.
+LOWER_IS_BETTER = {
+    'bigChancesMissed', 'offsides', 'dribbledPast', 'dispossessed', 'fouls',
+    'yellowCards', 'redCards', 'errorLeadToGoal', 'errorLeadToShot',
+    'goalsConceded', 'goalsConcededInsideTheBox', 'goalsConcededOutsideTheBox',
+}
+
+
+def compute_player_metrics(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Per-90 rates and per-position percentile ranks (0-100) for one season.
+
+    `df` holds a position column plus every STAT_FIELDS column. Counting
+    stats are ranked on their per-90 rate, percentage stats and volume on
+    their raw value. A higher value is a higher percentile, except for
+    LOWER_IS_BETTER stats, where it is the other way round. Rows under
+    MIN_MINUTES come back as NaN.
+    """
+    minutes = df['minutesPlayed'].to_numpy(dtype=float)
+    eligible = minutes >= MIN_MINUTES
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = df[PER90_FIELDS].to_numpy(dtype=float) / minutes[:, None] * 90
+    rates[~eligible] = np.nan
+    per90 = pd.DataFrame(rates, index=df.index, columns=PER90_FIELDS)
+
+    ranked = pd.concat([per90, df[RATE_FIELDS + VOLUME_FIELDS].astype(float)], axis=1)
+    ranked[~eligible] = np.nan
+    lower = sorted(LOWER_IS_BETTER)
+    ranked[lower] = -ranked[lower]
+    percentiles = ranked.groupby(df['position']).rank(pct=True) * 100
+    return per90.round(3), percentiles[STAT_FIELDS].round(1)
+
+
+def json_records(frame: pd.DataFrame) -> list[dict]:
+    # NaN is not valid JSON; store missing values as null.
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def rebuild_player_metrics(season: str) -> int:
+    """Recompute the season's PlayerMetrics rows from the stored players."""
+    df = pd.DataFrame.from_records(
+        Player.objects.filter(season=season).values_list('id', 'position', *STAT_FIELDS),
+        columns=['id', 'position', *STAT_FIELDS],
+    )
+    PlayerMetrics.objects.filter(season=season).delete()
+    if df.empty:
+        return 0
+
+    per90, percentiles = compute_player_metrics(df)
+    PlayerMetrics.objects.bulk_create([
+        PlayerMetrics(
+            player_id=player_id,
+            season=season,
+            position=position,
+            per90=rates,
+            percentiles=ranks,
+        )
+        for player_id, position, rates, ranks in zip(
+            df['id'], df['position'], json_records(per90), json_records(percentiles)
+        )
+    ], batch_size=500)
+    return len(df)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_remove_player_flag_url_remove_player_minutes_played_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestManifest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=100, unique=True)),
+                ('season', models.CharField(max_length=10)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('size', models.IntegerField(default=0)),
+                ('row_count', models.IntegerField(default=0)),
+                ('ingested_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
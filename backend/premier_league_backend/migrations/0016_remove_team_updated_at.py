@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_ingestmanifest'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='team',
+            name='updated_at',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:30
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_seasonversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['season', '-assists'], name='player_season_assists_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(models.F('season'), models.OrderBy(django.db.models.expressions.CombinedExpression(models.F('goals'), '+', models.F('assists')), descending=True), name='player_season_contrib_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_player_leaderboard_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(max_length=10)),
+                ('position', models.CharField(max_length=50)),
+                ('per90', models.JSONField(default=dict)),
+                ('percentiles', models.JSONField(default=dict)),
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='api.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['season', 'position'], name='metrics_season_position_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_player_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerCareer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player_id', models.CharField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('first_season', models.CharField(max_length=10)),
+                ('last_season', models.CharField(max_length=10)),
+                ('seasons', models.IntegerField(default=0)),
+                ('totals', models.JSONField(default=dict)),
+                ('percentages', models.JSONField(default=dict)),
+                ('per90', models.JSONField(default=dict)),
+                ('series', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_playercareer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expected_goals', models.FloatField(default=0.0)),
+                ('total_shots', models.IntegerField(default=0)),
+                ('shots_on_target', models.IntegerField(default=0)),
+                ('accurate_passes', models.IntegerField(default=0)),
+                ('possession_proxy', models.FloatField(default=0.0)),
+                ('top_scorer', models.CharField(blank=True, max_length=100, null=True)),
+                ('top_scorer_goals', models.IntegerField(default=0)),
+                ('top_assister', models.CharField(blank=True, max_length=100, null=True)),
+                ('top_assister_assists', models.IntegerField(default=0)),
+                ('players_used', models.IntegerField(default=0)),
+                ('squad_minutes', models.IntegerField(default=0)),
+                ('top11_minutes_share', models.FloatField(default=0.0)),
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='aggregates', to='api.team')),
+            ],
+        ),
+    ]
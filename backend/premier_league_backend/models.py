@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 
 class Team(models.Model):
     season = models.CharField(max_length=10, default='2024-25')
@@ -25,11 +26,37 @@ class Team(models.Model):
 
     class Meta:
         unique_together = ['season', 'team_name']
+        indexes = [
+            models.Index(fields=['season', 'rank'], name='team_season_rank_idx'),
+        ]
 
     def __str__(self):
         return f"{self.team_name} ({self.season})"
 
 
+class TeamAggregate(models.Model):
+    """Per-team figures derived from the season's Player rows by get_data."""
+
+    team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name="aggregates")
+    expected_goals = models.FloatField(default=0.0)
+    total_shots = models.IntegerField(default=0)
+    shots_on_target = models.IntegerField(default=0)
+    accurate_passes = models.IntegerField(default=0)
+    # 50 * accurate passes / the season's average per team: a rough share of the ball.
+    possession_proxy = models.FloatField(default=0.0)
+    top_scorer = models.CharField(max_length=100, blank=True, null=True)
+    top_scorer_goals = models.IntegerField(default=0)
+    top_assister = models.CharField(max_length=100, blank=True, null=True)
+    top_assister_assists = models.IntegerField(default=0)
+    players_used = models.IntegerField(default=0)
+    squad_minutes = models.IntegerField(default=0)
+    # Share of squad minutes played by the 11 most-used players.
+    top11_minutes_share = models.FloatField(default=0.0)
+
+    def __str__(self):
+        return f"Aggregates for {self.team}"
+
+
 class Player(models.Model):
     season = models.CharField(max_length=10, default="2023-24")
 
@@ -110,6 +137,74 @@ class Player(models.Model):
 
     class Meta:
         unique_together = ["season", "player_id"]
+        indexes = [
+            models.Index(fields=["season", "-goals", "player_id"], name="player_season_goals_idx"),
+            models.Index(fields=["season", "team"], name="player_season_team_idx"),
+            models.Index(fields=["season", "-assists", "player_id"], name="player_season_assists_idx"),
+            models.Index(
+                F("season"),
+                (F("goals") + F("assists")).desc(),
+                F("player_id"),
+                name="player_season_contrib_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.team.team_name}) - {self.season}"
+
+
+class IngestManifest(models.Model):
+    file_name = models.CharField(max_length=100, unique=True)
+    season = models.CharField(max_length=10)
+    content_hash = models.CharField(max_length=64)
+    size = models.IntegerField(default=0)
+    row_count = models.IntegerField(default=0)
+    ingested_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.season})"
+
+
+class SeasonVersion(models.Model):
+    season = models.CharField(max_length=10, unique=True)
+    version = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.season} v{self.version}"
+
+
+class PlayerMetrics(models.Model):
+    """Per-90 rates and per-position percentiles, rebuilt by get_data."""
+
+    player = models.OneToOneField(Player, on_delete=models.CASCADE, related_name="metrics")
+    season = models.CharField(max_length=10)
+    position = models.CharField(max_length=50)
+    per90 = models.JSONField(default=dict)
+    percentiles = models.JSONField(default=dict)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["season", "position"], name="metrics_season_position_idx"),
+        ]
+
+    def __str__(self):
+        return f"Metrics for {self.player_id} ({self.season})"
+
+
+class PlayerCareer(models.Model):
+    """A player's rollup across every stored season, rebuilt by get_data."""
+
+    player_id = models.CharField(max_length=100, unique=True)
+    name = models.CharField(max_length=100)
+    first_season = models.CharField(max_length=10)
+    last_season = models.CharField(max_length=10)
+    seasons = models.IntegerField(default=0)
+    totals = models.JSONField(default=dict)
+    percentages = models.JSONField(default=dict)
+    per90 = models.JSONField(default=dict)
+    series = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.first_season} to {self.last_season})"
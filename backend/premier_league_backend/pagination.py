@@ -0,0 +1,183 @@
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _flip(ordering: str) -> str:
+    return ordering[1:] if ordering.startswith('-') else f'-{ordering}'
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks past the last row instead of using OFFSET.
+
+    The ordering comes from the queryset (so from OrderingFilter when the
+    view has one) with `tiebreak` appended to make it total. A cursor holds
+    that ordering and the boundary row's values for it; the next page is
+    `WHERE (ordering) > boundary ORDER BY ordering LIMIT page_size`, so a
+    deep page costs the same as the first one.
+
+    The first page (no cursor) also reports `count`, the number of rows
+    matching the filters; later pages leave it out, so paging costs no
+    COUNT. Besides the usual paginate_queryset(), views rendering rows
+    without model instances can call page_queryset(), count_rows() (or
+    acount_rows()) and then paginate_rows().
+    """
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    tiebreak = 'player_id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset) -> list:
+        ordering = [str(field) for field in queryset.query.order_by]
+        if self.tiebreak not in {field.lstrip('-') for field in ordering}:
+            ordering.append(self.tiebreak)
+        return ordering
+
+    def key_fields(self) -> list:
+        return [field.lstrip('-') for field in self.ordering]
+
+    def encode_cursor(self, keys, reverse: bool) -> str:
+        payload = json.dumps({'o': self.ordering, 'k': keys, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            ordering, keys, reverse = cursor['o'], cursor['k'], bool(cursor['r'])
+            # A cursor only makes sense for the ordering (a list of field
+            # names) it was issued under, with one plain value per field.
+            if (
+                ordering != self.ordering
+                or not isinstance(keys, list)
+                or len(keys) != len(ordering)
+                or not all(isinstance(key, (str, int, float)) for key in keys)
+            ):
+                raise ValueError('cursor does not match the ordering')
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return keys, reverse
+
+    def seek(self, ordering: list, keys: list) -> Q:
+        """Rows strictly after `keys` in `ordering`, as a lexicographic Q."""
+        def after(field, key):
+            return Q(**{f"{field.lstrip('-')}__{'lt' if field.startswith('-') else 'gt'}": key})
+
+        condition = after(ordering[-1], keys[-1])
+        for field, key in zip(ordering[-2::-1], keys[-2::-1]):
+            condition = after(field, key) | (Q(**{field.lstrip('-'): key}) & condition)
+
+        # Redundant bound on the leading column so the index can seek to it.
+        first = ordering[0]
+        bound = f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}"
+        return Q(**{bound: keys[0]}) & condition
+
+    def page_queryset(self, queryset, request, view=None):
+        """Order, seek and slice `queryset`; the result holds page_size + 1 rows."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.cursor = self.decode_cursor(request)
+        self.count = None
+        self.count_queryset = queryset.order_by() if self.cursor is None else None
+
+        ordering = self.ordering
+        if self.cursor is not None:
+            keys, reverse = self.cursor
+            if reverse:
+                ordering = [_flip(field) for field in ordering]
+            queryset = queryset.order_by(*ordering).filter(self.seek(ordering, keys))
+        else:
+            queryset = queryset.order_by(*ordering)
+        return queryset[:self.page_size + 1]
+
+    def count_rows(self):
+        """Set `count` for a first page from page_queryset()'s filtered rows."""
+        if self.count_queryset is not None:
+            self.count = self.count_queryset.count()
+
+    async def acount_rows(self):
+        if self.count_queryset is not None:
+            self.count = await self.count_queryset.acount()
+
+    def row_keys(self, row) -> list:
+        if isinstance(row, dict):
+            return [row[field] for field in self.key_fields()]
+        return [reduce(getattr, field.split('__'), row) for field in self.key_fields()]
+
+    def paginate_rows(self, rows: list) -> list:
+        """Trim rows fetched from page_queryset() and remember the page boundaries."""
+        reverse = self.cursor is not None and self.cursor[1]
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_keys = self.previous_keys = None
+        if rows:
+            if has_more or reverse:
+                self.next_keys = self.row_keys(rows[-1])
+            if (has_more and reverse) or (self.cursor is not None and not reverse):
+                self.previous_keys = self.row_keys(rows[0])
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        self.count_rows()
+        return self.paginate_rows(list(queryset))
+
+    def get_link(self, keys, reverse: bool):
+        if keys is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(keys, reverse))
+
+    def get_next_link(self):
+        return self.get_link(self.next_keys, reverse=False)
+
+    def get_previous_link(self):
+        return self.get_link(self.previous_keys, reverse=True)
+
+    def get_paginated_data(self, results) -> dict:
+        data = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': results,
+        }
+        if self.count is not None:
+            data = {'count': self.count, **data}
+        return data
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'description': 'Matching rows; first page only.'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
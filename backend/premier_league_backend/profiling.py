@@ -0,0 +1,244 @@
+"""Per-route request metrics, enabled by settings.API_METRICS_ENABLED.
+
+MetricsMiddleware times each request and, through a database execute
+wrapper, its queries; `with serializing():` blocks mark serialization.
+Totals are kept per (route, method) in this process and rendered in the
+Prometheus text format by render_metrics() for /api/_metrics. Each
+response also gets a Server-Timing header. When disabled the middleware
+removes itself and no wrapper is installed, so the only cost left is
+serializing() finding no request.
+"""
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# Upper bounds in seconds, as Prometheus histogram buckets.
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+current_request = ContextVar('current_request', default=None)
+
+
+def metrics_enabled() -> bool:
+    return getattr(settings, 'API_METRICS_ENABLED', False)
+
+
+class RequestStats:
+    """Timings of one request. sync_to_async copies the context, so ORM calls
+    made on worker threads for an async view still land here."""
+
+    __slots__ = ('queries', 'db_time', 'serialize_time', 'active')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.active = False
+
+
+def query_timer(execute, sql, params, many, context):
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - started
+        stats.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver adding query_timer to the connection."""
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+class serializing:
+    """Count the enclosed block, minus its queries, as serialization time.
+
+    Nested blocks count once, so serializers can be wrapped both where they
+    are defined and where views call them.
+    """
+
+    __slots__ = ('stats', 'started', 'db_time')
+
+    def __enter__(self):
+        stats = current_request.get()
+        if stats is None or stats.active:
+            self.stats = None
+            return self
+        stats.active = True
+        self.stats = stats
+        self.started = time.perf_counter()
+        self.db_time = stats.db_time
+        return self
+
+    def __exit__(self, *exc_info):
+        stats = self.stats
+        if stats is not None:
+            elapsed = time.perf_counter() - self.started
+            stats.serialize_time += elapsed - (stats.db_time - self.db_time)
+            stats.active = False
+
+
+class RouteMetrics:
+    __slots__ = ('buckets', 'count', 'duration', 'queries', 'db_time', 'serialize_time')
+
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.statuses = Counter()
+
+    def observe(self, route: str, method: str, status: int, duration: float, stats: RequestStats):
+        with self.lock:
+            metrics = self.routes.get((route, method))
+            if metrics is None:
+                metrics = self.routes[(route, method)] = RouteMetrics()
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    metrics.buckets[index] += 1
+                    break
+            metrics.count += 1
+            metrics.duration += duration
+            metrics.queries += stats.queries
+            metrics.db_time += stats.db_time
+            metrics.serialize_time += stats.serialize_time
+            self.statuses[(route, method, status)] += 1
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+            self.statuses.clear()
+
+
+registry = MetricsRegistry()
+
+
+def route_of(request) -> str:
+    # The URL pattern, not the path, so ids and names don't explode the label set.
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else '<unmatched>'
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, stats, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, stats, time.perf_counter() - started)
+
+    def process_template_response(self, request, response):
+        # DRF Responses are rendered after the view returns; count that too.
+        span = serializing()
+        span.__enter__()
+        response.add_post_render_callback(lambda rendered: span.__exit__(None, None, None))
+        return response
+
+    def finish(self, request, response, stats, duration):
+        registry.observe(route_of(request), request.method, response.status_code, duration, stats)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries"',
+            f'serialize;dur={stats.serialize_time * 1000:.2f}',
+            f'total;dur={duration * 1000:.2f}',
+        ])
+        return response
+
+
+def _labels(**labels) -> str:
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def render_metrics(cache_stats: dict = None) -> str:
+    """Everything recorded by this process, in the Prometheus text format."""
+    with registry.lock:
+        routes = sorted(
+            (key, [list(m.buckets), m.count, m.duration, m.queries, m.db_time, m.serialize_time])
+            for key, m in registry.routes.items()
+        )
+        statuses = sorted(registry.statuses.items())
+
+    lines = [
+        '# HELP api_request_duration_seconds Request latency by route.',
+        '# TYPE api_request_duration_seconds histogram',
+    ]
+    for (route, method), (buckets, count, duration, *_) in routes:
+        cumulative = 0
+        for bound, observed in zip(DURATION_BUCKETS, buckets):
+            cumulative += observed
+            lines.append(f'api_request_duration_seconds_bucket{_labels(route=route, method=method, le=bound)} {cumulative}')
+        lines.append(f'api_request_duration_seconds_bucket{_labels(route=route, method=method, le="+Inf")} {count}')
+        lines.append(f'api_request_duration_seconds_sum{_labels(route=route, method=method)} {duration:.6f}')
+        lines.append(f'api_request_duration_seconds_count{_labels(route=route, method=method)} {count}')
+
+    lines += [
+        '# HELP api_requests_total Requests by route and response status.',
+        '# TYPE api_requests_total counter',
+    ]
+    for (route, method, status), count in statuses:
+        lines.append(f'api_requests_total{_labels(route=route, method=method, status=status)} {count}')
+
+    for index, (name, help_text, fmt) in enumerate([
+        ('api_db_queries_total', 'SQL queries executed.', '{}'),
+        ('api_db_duration_seconds_total', 'Time spent executing SQL.', '{:.6f}'),
+        ('api_serialize_duration_seconds_total', 'Time spent building response bodies, excluding SQL.', '{:.6f}'),
+    ], start=3):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for (route, method), values in routes:
+            lines.append(f'{name}{_labels(route=route, method=method)} {fmt.format(values[index])}')
+
+    if cache_stats is not None:
+        for key in ('hits', 'misses', 'not_modified', 'evictions'):
+            lines += [
+                f'# TYPE api_response_cache_{key}_total counter',
+                f'api_response_cache_{key}_total {cache_stats[key]}',
+            ]
+        for key in ('entries', 'bytes'):
+            lines += [
+                f'# TYPE api_response_cache_{key} gauge',
+                f'api_response_cache_{key} {cache_stats[key]}',
+            ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,85 @@
+import re
+import unicodedata
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+from .models import Player
+
+SEARCH_TABLE = 'api_player_search'
+
+# Letters without a Unicode decomposition, which NFKD would leave alone.
+FOLD_TABLE = str.maketrans({
+    'ø': 'o', 'Ø': 'o', 'æ': 'ae', 'Æ': 'ae', 'œ': 'oe', 'Œ': 'oe', 'ß': 'ss',
+    'ł': 'l', 'Ł': 'l', 'đ': 'd', 'Đ': 'd', 'ð': 'd', 'Ð': 'd', 'þ': 'th', 'Þ': 'th',
+    'ı': 'i',
+})
+
+CREATE_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+    f"USING fts5(name, team, season UNINDEXED, tokenize='unicode61', prefix='2 3')"
+)
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents: 'Ødegaard' -> 'odegaard', 'Müller' -> 'muller'."""
+    decomposed = unicodedata.normalize('NFKD', text.translate(FOLD_TABLE))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def match_query(q: str) -> str:
+    """FTS5 query where every folded word of `q` must match as a prefix."""
+    return ' '.join(f'"{token}"*' for token in re.findall(r'\w+', fold(q)))
+
+
+def rebuild_search_index(season: str = None, using: str = DEFAULT_DB_ALIAS) -> int:
+    """Reindex the players of `season` (every season if None).
+
+    Uses plain SQL only, so the migration that creates the table can call it.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return 0
+
+    where, params = ('WHERE p.season = %s', [season]) if season else ('', [])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT p.id, p.name, t.team_name, p.season FROM api_player p "
+            f"JOIN api_team t ON t.id = p.team_id {where}",
+            params,
+        )
+        rows = [(pk, fold(name), fold(team), row_season) for pk, name, team, row_season in cursor.fetchall()]
+
+        if season:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE season = %s", [season])
+        else:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, name, team, season) VALUES (%s, %s, %s, %s)", rows
+        )
+    return len(rows)
+
+
+def search_player_ids(q: str, season: str = None, limit: int = 10) -> list:
+    """Player primary keys matching `q`, best first (name hits outrank team hits)."""
+    query = match_query(q)
+    if not query:
+        return []
+
+    connection = connections[router.db_for_read(Player) or DEFAULT_DB_ALIAS]
+    if connection.vendor != 'sqlite':
+        queryset = Player.objects.filter(name__icontains=q)
+        if season:
+            queryset = queryset.filter(season=season)
+        return list(queryset.order_by('name').values_list('pk', flat=True)[:limit])
+
+    sql = f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+    params = [query]
+    if season:
+        sql += " AND season = %s"
+        params.append(season)
+    sql += f" ORDER BY bm25({SEARCH_TABLE}, 10.0, 1.0) LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [pk for (pk,) in cursor.fetchall()]
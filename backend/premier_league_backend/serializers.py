@@ -1,14 +1,114 @@
+import json
+
 from rest_framework import serializers
-from .models import Team, Player
+from .models import Team, TeamAggregate, Player, PlayerCareer, PlayerMetrics
+from .profiling import serializing
+
+class TeamAggregateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TeamAggregate
+        exclude = ['id', 'team']
 
 class TeamSerializer(serializers.ModelSerializer):
+    # None until get_data has aggregated the season; select_related('aggregates') when listing.
+    aggregates = TeamAggregateSerializer(read_only=True)
+
     class Meta:
         model = Team
         fields = '__all__'
 
 class PlayerSerializer(serializers.ModelSerializer):
     team_name = serializers.CharField(source='team.team_name', read_only=True)
-    
+
     class Meta:
         model = Player
         fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        # Optional sparse fieldset, e.g. PlayerSerializer(qs, many=True, fields=['name', 'goals'])
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class PlayerMetricsSerializer(serializers.ModelSerializer):
+    player_id = serializers.CharField(source='player.player_id', read_only=True)
+    name = serializers.CharField(source='player.name', read_only=True)
+
+    class Meta:
+        model = PlayerMetrics
+        fields = ['player', 'player_id', 'name', 'season', 'position', 'per90', 'percentiles']
+
+
+class PlayerCareerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PlayerCareer
+        exclude = ['id']
+
+
+class PlayerValuesSerializer:
+    """Read-only fast path that renders the same JSON bytes as
+    JSONRenderer().render(PlayerSerializer(queryset, many=True).data).
+
+    Rows come straight from queryset.values_list() instead of model
+    instances; only fields whose representation differs from the stored
+    value (datetimes) go through their serializer field. `extra` names
+    queryset annotations appended to each row as-is.
+    """
+
+    lookups = {'team_name': 'team__team_name'}
+
+    def __init__(self, fields=None, extra=()):
+        serializer_fields = PlayerSerializer(fields=fields).fields
+        self.names = list(serializer_fields) + list(extra)
+        self.converters = [
+            (index, field.to_representation)
+            for index, field in enumerate(serializer_fields.values())
+            if isinstance(field, serializers.DateTimeField)
+        ]
+
+    def values(self, queryset):
+        return queryset.values_list(*[self.lookups.get(name, name) for name in self.names])
+
+    def rows(self, queryset):
+        return self.to_rows(self.values(queryset))
+
+    async def arows(self, queryset):
+        """rows() for async views.
+
+        `async for` fetches the whole result in one thread hop; aiterator()
+        would hop per chunk and, for values_list(), starts the query in the
+        event loop thread.
+        """
+        return self.to_rows([row async for row in self.values(queryset)])
+
+    def to_rows(self, values) -> list:
+        names = self.names
+        with serializing():
+            return [dict(zip(names, row)) for row in self.to_tuples(values)]
+
+    def to_tuples(self, values) -> list:
+        """values_list() rows with datetimes converted, in `names` order."""
+        if not self.converters:
+            return values if isinstance(values, list) else list(values)
+
+        rows = []
+        for row in values:
+            row = list(row)
+            for index, convert in self.converters:
+                if row[index] is not None:
+                    row[index] = convert(row[index])
+            rows.append(row)
+        return rows
+
+    def render(self, queryset) -> bytes:
+        return self.dumps(self.rows(queryset))
+
+    @staticmethod
+    def dumps(data) -> bytes:
+        # Same options JSONRenderer uses with the default UNICODE_JSON/STRICT_JSON settings.
+        with serializing():
+            content = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+        return content.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
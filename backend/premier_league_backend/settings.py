@@ -1,4 +1,5 @@
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -22,6 +23,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest; removes itself unless API_METRICS_ENABLED.
+    'premier_league_backend.profiling.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -51,13 +54,43 @@ TEMPLATES = [
 
 WSGI_APPLICATION = None
 
+ASGI_APPLICATION = 'premier_league_backend.asgi.application'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections (and their warmed page cache) across requests.
+        # asgi.py defaults this to 0: per-request threads cannot reuse them.
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# Optional read-only alias for API reads, e.g. DJANGO_SQLITE_REPLICA=db.sqlite3
+# to read the primary file through separate read-only connections, or the path
+# of a copy kept in sync externally. See premier_league_backend/db.py.
+if os.environ.get('DJANGO_SQLITE_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': f"file:{BASE_DIR / os.environ['DJANGO_SQLITE_REPLICA']}?mode=ro",
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['premier_league_backend.db.ReadReplicaRouter']
+
+# Applied to every new SQLite connection (premier_league_backend/db.py).
+SQLITE_PRAGMAS = {
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negative means KiB: 64 MiB
+    'temp_store': 'memory',
 }
 
+# Stored in the database file itself, so get_data sets it once instead of
+# every connection rewriting the file (see premier_league_backend/db.py).
+SQLITE_JOURNAL_MODE = 'wal'
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -83,5 +116,21 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# The migrations use BigAutoField ids; pin it so older Django agrees.
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
 CORS_ALLOW_ALL_ORIGINS = True
 
+# In-process LRU for season list responses (see premier_league_backend/cache.py).
+SEASON_CACHE_MAX_ENTRIES = 256
+SEASON_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Precompressed per-season teams+players snapshots written by get_data.
+SNAPSHOT_DIR = BASE_DIR / 'data' / 'snapshots'
+
+# Per-season similar-player indexes (.npy, memory-mapped by the API).
+SIMILARITY_DIR = BASE_DIR / 'data' / 'similarity'
+
+# Per-route latency histograms, query counts and Server-Timing headers,
+# exposed at /api/_metrics (premier_league_backend/profiling.py).
+API_METRICS_ENABLED = os.environ.get('DJANGO_API_METRICS') == '1'
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .metrics import PER90_FIELDS, RATE_FIELDS, STAT_FIELDS, compute_player_metrics
+from .models import Player
+
+FEATURES = PER90_FIELDS + RATE_FIELDS
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def index_path(season: str) -> str:
+    return os.path.join(settings.SIMILARITY_DIR, f'{season}.npy')
+
+
+def build_similarity_index(season: str) -> np.ndarray:
+    """Structured array of (id, position, vector) for the season's players.
+
+    Vectors are the per-90 and percentage stats standardized within each
+    position, so distances compare a player to positional peers. Players
+    under metrics.MIN_MINUTES have no per-90 rates and are left out.
+    """
+    df = pd.DataFrame.from_records(
+        Player.objects.filter(season=season).values_list('id', 'position', *STAT_FIELDS),
+        columns=['id', 'position', *STAT_FIELDS],
+    )
+    dtype = [('id', 'i8'), ('position', 'U8'), ('vector', 'f4', (len(FEATURES),))]
+    if df.empty:
+        return np.empty(0, dtype=dtype)
+
+    per90, _ = compute_player_metrics(df)
+    features = pd.concat([per90, df[RATE_FIELDS].astype(float)], axis=1)[FEATURES]
+    keep = per90.notna().all(axis=1).to_numpy()
+    features, df = features[keep], df[keep]
+
+    grouped = features.groupby(df['position'])
+    std = grouped.transform('std').replace(0, np.nan)
+    standardized = ((features - grouped.transform('mean')) / std).fillna(0.0)
+
+    index = np.empty(len(df), dtype=dtype)
+    index['id'] = df['id'].to_numpy()
+    index['position'] = df['position'].to_numpy()
+    index['vector'] = standardized.to_numpy(dtype='f4')
+    return index
+
+
+def write_similarity_index(season: str) -> int:
+    """Persist the season's index as one .npy file, replaced atomically.
+
+    Each writer gets its own temporary file, so concurrent writes of one
+    season cannot interleave; the last os.replace() wins.
+    """
+    index = build_similarity_index(season)
+    os.makedirs(settings.SIMILARITY_DIR, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(dir=settings.SIMILARITY_DIR, suffix='.tmp', delete=False)
+    try:
+        with f:
+            np.save(f, index)
+        os.replace(f.name, index_path(season))
+    except BaseException:
+        os.unlink(f.name)
+        raise
+    return len(index)
+
+
+def load_similarity_index(season: str):
+    """Memory-map the season's index file.
+
+    Each process keeps the mapping and only reopens the file after get_data
+    has replaced it. Only get_data writes the files: for a season without
+    one, each process builds the index in memory once, under the lock so
+    concurrent requests share that build, and switches to the file when it
+    appears.
+    """
+    path = index_path(season)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    with _lock:
+        cached = _loaded.get(season)
+        if cached is None or cached[0] != mtime:
+            index = build_similarity_index(season) if mtime is None else np.load(path, mmap_mode='r')
+            cached = _loaded[season] = (mtime, index)
+    return cached[1]
+
+
+def nearest_players(season: str, player_pk: int, k: int = 10, metric: str = 'cosine'):
+    """[(player pk, score)] for the k most similar players at the same position.
+
+    Cosine scores are similarities (higher is closer), Euclidean scores are
+    distances (lower is closer). None if the player is not in the index.
+    """
+    index = load_similarity_index(season)
+    rows = np.flatnonzero(index['id'] == player_pk)
+    if not len(rows):
+        return None
+
+    target = index[rows[0]]
+    peers = index[(index['position'] == target['position']) & (index['id'] != player_pk)]
+    vectors = peers['vector']
+
+    if metric == 'cosine':
+        norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(target['vector'])
+        scores = np.divide(vectors @ target['vector'], norms, out=np.zeros(len(peers), 'f4'), where=norms > 0)
+        order = np.argsort(-scores)[:k]
+    else:
+        scores = np.linalg.norm(vectors - target['vector'], axis=1)
+        order = np.argsort(scores)[:k]
+
+    return [(int(peers['id'][i]), round(float(scores[i]), 4)) for i in order]
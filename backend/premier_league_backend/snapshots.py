@@ -0,0 +1,60 @@
+import gzip
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from .models import Team, Player
+from .serializers import TeamSerializer, PlayerValuesSerializer
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always written
+    brotli = None
+
+
+def snapshot_path(season: str, encoding: str = 'gzip') -> str:
+    extension = {'gzip': 'json.gz', 'br': 'json.br'}[encoding]
+    return os.path.join(settings.SNAPSHOT_DIR, f'{season}.{extension}')
+
+
+def build_snapshot(season: str) -> bytes:
+    """Render {"season", "teams", "players"} exactly as the list endpoints would."""
+    teams = Team.objects.select_related('aggregates').filter(season=season).order_by('rank')
+    players = Player.objects.select_related('team').filter(season=season).order_by('-goals')
+    return b''.join([
+        b'{"season":', json.dumps(season).encode(),
+        b',"teams":', JSONRenderer().render(TeamSerializer(teams, many=True).data),
+        b',"players":', PlayerValuesSerializer().render(players),
+        b'}',
+    ])
+
+
+def _write_atomic(path: str, content: bytes):
+    # A temporary file per writer, so concurrent writes never share one.
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix='.tmp', delete=False)
+    try:
+        with f:
+            f.write(content)
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+
+def write_snapshot(season: str) -> bool:
+    """Materialize a season's compressed snapshot; False if the season has no data.
+
+    Only get_data calls this; the API builds a missing snapshot in memory.
+    """
+    if not Team.objects.filter(season=season).exists():
+        return False
+
+    os.makedirs(settings.SNAPSHOT_DIR, exist_ok=True)
+    content = build_snapshot(season)
+    _write_atomic(snapshot_path(season, 'gzip'), gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(snapshot_path(season, 'br'), brotli.compress(content))
+    return True
@@ -0,0 +1,629 @@
+import base64
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+import pandas as pd
+import pyarrow as pa
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.utils.urls import replace_query_param
+
+from .aggregates import rebuild_team_aggregates, team_aggregate_frame
+from .cache import bump_season_version, response_cache
+from .careers import rebuild_careers
+from . import columns, exports
+from .columns import (
+    PLAYER_COLUMNS, SCRAPED_COLUMNS, TEAM_COLUMNS, apply_column_map, combine_position_frames, content_hash,
+    normalize_columns, parquet_path, parquet_source_hash, read_player_frame,
+)
+from .management.commands import get_data
+from .metrics import STAT_FIELDS, compute_player_metrics
+from .models import IngestManifest, Player, PlayerCareer, Team
+from .profiling import registry
+from .search import rebuild_search_index
+from .similarity import _loaded, load_similarity_index
+
+SEASON = '2024-25'
+
+
+class ListEndpointTests(TestCase):
+    """Query counts and caching of the list endpoints.
+
+    Each endpoint costs a fixed number of queries, however many rows it returns.
+    A cold request reads the season version and then its rows in one query
+    (team names and aggregates come joined in), plus a COUNT on a first
+    players page; a cached one reads only the version. There are more rows
+    than queries, so an N+1 on team would show up here.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for rank, team_name in enumerate(['Arsenal', 'Chelsea', 'Liverpool'], start=1):
+            team = Team.objects.create(season=SEASON, team_name=team_name, rank=rank)
+            for n in range(4):
+                Player.objects.create(
+                    season=SEASON,
+                    player_id=f'{team_name.lower()}-{n}',
+                    name=f'{team_name} Player {n}',
+                    team=team,
+                    position='MF',
+                    minutesPlayed=900 * (n + 1),
+                    goals=rank + n,
+                    assists=n,
+                )
+        rebuild_team_aggregates(SEASON)
+        rebuild_search_index(SEASON)
+        bump_season_version(SEASON)
+
+    def setUp(self):
+        response_cache.clear()
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def assertListQueries(self, url, cold, cached=1):
+        with self.assertNumQueries(cold):
+            first = self.get(url)
+        with self.assertNumQueries(cached):
+            self.assertEqual(self.get(url), first)
+        return first
+
+    def test_players(self):
+        data = self.assertListQueries(f'/api/players/?season={SEASON}', 3)
+        self.assertEqual(data['count'], 12)
+        self.assertEqual(len(data['results']), 12)
+        self.assertEqual({row['team_name'] for row in data['results']}, {'Arsenal', 'Chelsea', 'Liverpool'})
+
+    def test_players_sparse_fields(self):
+        data = self.assertListQueries(f'/api/players/?season={SEASON}&fields=name,team_name', 3)
+        self.assertEqual(set(data['results'][0]), {'name', 'team_name'})
+
+    def test_players_search(self):
+        with self.assertNumQueries(2):
+            data = self.get(f'/api/players/search/?q=chel&season={SEASON}')
+        self.assertEqual({row['team_name'] for row in data}, {'Chelsea'})
+
+    def test_players_search_folds_accents(self):
+        team = Team.objects.get(season=SEASON, team_name='Arsenal')
+        Player.objects.create(season=SEASON, player_id='odegaard', name='Martin Ødegaard', team=team, position='MF')
+        rebuild_search_index(SEASON)
+
+        for q in ['odegaard', 'Ødeg', 'ODEGAARD', 'martin ode']:
+            with self.subTest(q=q):
+                data = self.get(f'/api/players/search/?q={q}&season={SEASON}')
+                self.assertEqual([row['name'] for row in data], ['Martin Ødegaard'])
+
+    def test_teams(self):
+        data = self.assertListQueries(f'/api/teams/?season={SEASON}', 2)
+        self.assertEqual([team['team_name'] for team in data], ['Arsenal', 'Chelsea', 'Liverpool'])
+        self.assertEqual(data[0]['aggregates']['top_scorer'], 'Arsenal Player 3')
+
+    def test_leaderboard_orders_by_metric_then_player_id(self):
+        data = self.assertListQueries(f'/api/leaderboards/?season={SEASON}&metric=goals&limit=6', 2)
+        self.assertEqual(
+            [(row['player_id'], row['goals']) for row in data],
+            [('liverpool-3', 6), ('chelsea-3', 5), ('liverpool-2', 5),
+             ('arsenal-3', 4), ('chelsea-2', 4), ('liverpool-1', 4)],
+        )
+
+        data = self.get(f'/api/leaderboards/?season={SEASON}&metric=goal_contributions&team=Arsenal&limit=2')
+        self.assertEqual([(row['player_id'], row['goal_contributions']) for row in data],
+                         [('arsenal-3', 7), ('arsenal-2', 5)])
+
+    def test_leaderboard_rejects_unknown_metric(self):
+        response = self.client.get(f'/api/leaderboards/?season={SEASON}&metric=name', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('metric', response.json())
+
+    def test_all_seasons_list_follows_every_season(self):
+        self.assertEqual(len(self.get('/api/teams/?season=')), 3)
+        Team.objects.create(season='2023-24', team_name='Arsenal', rank=1)
+        bump_season_version('2023-24')
+        self.assertEqual(len(self.get('/api/teams/?season=')), 4)
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'localhost'])
+    def test_players_cache_is_per_host(self):
+        url = f'/api/players/?season={SEASON}&page_size=5'
+        first = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_HOST='testserver').json()
+        other = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_HOST='localhost').json()
+        self.assertTrue(first['next'].startswith('http://testserver/'))
+        self.assertTrue(other['next'].startswith('http://localhost/'))
+
+    def test_players_count_reflects_filters(self):
+        data = self.get(f'/api/players/?season={SEASON}&search=chelsea&page_size=2')
+        self.assertEqual(data['count'], 4)
+        with self.assertNumQueries(2):
+            second = self.client.get(data['next'], HTTP_ACCEPT='application/json').json()
+        self.assertNotIn('count', second)
+        self.assertEqual(len(second['results']), 2)
+
+    def test_players_tampered_cursor_is_404(self):
+        url = f'/api/players/?season={SEASON}&page_size=2'
+        next_url = self.get(url)['next']
+        encoded = next_url.split('cursor=')[1].split('&')[0]
+        cursor = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+
+        for tampered in [
+            {**cursor, 'k': 5},
+            {**cursor, 'k': [{}, []]},
+            {**cursor, 'k': cursor['k'][:1]},
+            {**cursor, 'o': ['-assists', 'player_id']},
+            {**cursor, 'o': 'player_id'},
+            [cursor],
+        ]:
+            with self.subTest(cursor=tampered):
+                payload = base64.urlsafe_b64encode(json.dumps(tampered).encode()).decode()
+                response = self.client.get(replace_query_param(next_url, 'cursor', payload))
+                self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(replace_query_param(url, 'cursor', 'not-base64!')).status_code, 404)
+
+
+class ColumnMapTests(SimpleTestCase):
+    def test_headers_are_matched_by_alias_and_values_typed(self):
+        raw = pd.DataFrame({
+            ' Player ID ': [7, 8],
+            'Player': ['Ødegaard', None],
+            'Minutes': ['900', 'n/a'],
+            'xG': [1.5, None],
+            'Goals': [3, 4],
+        })
+        df = apply_column_map(normalize_columns(raw), PLAYER_COLUMNS)
+
+        self.assertEqual(list(df.columns), list(PLAYER_COLUMNS))
+        self.assertEqual(list(df['player_id']), ['7', '8'])
+        self.assertEqual(list(df['name']), ['Ødegaard', ''])
+        # Unparseable and missing numbers fall back to the dtype's default.
+        self.assertEqual(list(df['minutesPlayed']), [900, 0])
+        self.assertEqual(list(df['expectedGoals']), [1.5, 0.0])
+        self.assertEqual(str(df['goals'].dtype), 'int64')
+        self.assertEqual(list(df['assists']), [0, 0])
+
+    def test_first_alias_present_wins(self):
+        raw = pd.DataFrame({'minutes': [1], 'minutesplayed': [2], 'team': ['Arsenal']})
+        df = apply_column_map(raw, PLAYER_COLUMNS)
+        self.assertEqual(df['minutesPlayed'].iloc[0], 2)
+        self.assertEqual(apply_column_map(raw, TEAM_COLUMNS)['team_name'].iloc[0], 'Arsenal')
+
+
+class CombinePositionFramesTests(SimpleTestCase):
+    def test_frames_are_stacked_with_their_position(self):
+        frames = {
+            'GK': pd.DataFrame({
+                'player': ['Raya'], 'goals': [0],
+                'goalsConcededInsideTheBox': [20], 'goalsConcededOutsideTheBox': [4],
+            }),
+            'FW': pd.DataFrame({'player': ['Saka'], 'goals': [10], 'rating': [7.6]}),
+        }
+        with self.assertLogs('premier_league_backend.columns', 'WARNING') as logs:
+            df = combine_position_frames(frames)
+
+        self.assertEqual(list(df.columns), SCRAPED_COLUMNS)
+        self.assertEqual(list(df['position']), ['GK', 'FW'])
+        self.assertEqual(list(df['player']), ['Raya', 'Saka'])
+        # Outfield rows get 0 conceded, kept integer rather than float.
+        self.assertEqual(list(df['goalsConceded']), [24, 0])
+        self.assertEqual(str(df['goalsConcededInsideTheBox'].dtype), 'int64')
+        self.assertIn('rating', logs.output[0])
+        self.assertNotIn('position', frames['GK'].columns)
+
+
+class TeamAggregateTests(SimpleTestCase):
+    def test_aggregates_per_team(self):
+        df = pd.DataFrame({
+            'team_id': [1, 1, 1, 2],
+            'player_id': ['20', '100', '3', '7'],
+            'name': ['Twenty', 'Hundred', 'Three', 'Seven'],
+            'goals': [5, 5, 1, 2],
+            'assists': [0, 1, 4, 0],
+            'expectedGoals': [4.111, 3.5, 0.5, 1.0],
+            'totalShots': [30, 25, 5, 10],
+            'shotsOnTarget': [10, 9, 2, 3],
+            'accuratePasses': [300, 200, 100, 200],
+            'minutesPlayed': [2000, 1500, 0, 900],
+        })
+        frame = team_aggregate_frame(df)
+
+        self.assertEqual(frame.at[1, 'expected_goals'], 8.11)
+        self.assertEqual(frame.at[1, 'players_used'], 2)
+        self.assertEqual(frame.at[2, 'players_used'], 1)
+        # 600 and 200 accurate passes against a mean of 400.
+        self.assertEqual(list(frame['possession_proxy']), [75.0, 25.0])
+        # Tied on goals: '100' sorts before '20' as a string.
+        self.assertEqual(frame.at[1, 'top_scorer'], 'Hundred')
+        self.assertEqual(frame.at[1, 'top_assister'], 'Three')
+        self.assertEqual(frame.at[1, 'top11_minutes_share'], 100.0)
+
+
+class PlayerParquetTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.csv_path = os.path.join(directory.name, 'EPL_24_25.csv')
+        self.write_csv(goals=[10, 4])
+
+    def write_csv(self, goals):
+        pd.DataFrame({
+            'player id': ['1', '2'], 'player': ['Saka', 'Rice'], 'team': ['Arsenal', 'Arsenal'], 'goals': goals,
+        }).to_csv(self.csv_path, index=False)
+
+    def test_cache_is_built_then_read_instead_of_the_csv(self):
+        df = read_player_frame(self.csv_path)
+        self.assertEqual(list(df['goals']), [10, 4])
+        self.assertEqual(parquet_source_hash(parquet_path(self.csv_path)), content_hash(self.csv_path))
+
+        with mock.patch.object(columns, 'read_player_csv', side_effect=AssertionError('CSV parsed')):
+            cached = read_player_frame(self.csv_path, columns=['player_id', 'goals'])
+        self.assertEqual(list(cached.columns), ['player_id', 'goals'])
+        self.assertEqual(list(cached['goals']), [10, 4])
+
+    def test_changed_csv_rebuilds_the_cache(self):
+        read_player_frame(self.csv_path)
+        self.write_csv(goals=[11, 4])
+        self.assertEqual(list(read_player_frame(self.csv_path)['goals']), [11, 4])
+        self.assertEqual(parquet_source_hash(parquet_path(self.csv_path)), content_hash(self.csv_path))
+
+    def test_cache_is_used_when_the_csv_is_gone(self):
+        read_player_frame(self.csv_path)
+        os.remove(self.csv_path)
+        self.assertEqual(list(read_player_frame(self.csv_path)['name']), ['Saka', 'Rice'])
+
+
+class PlayerMetricsTests(SimpleTestCase):
+    def test_percentiles_rank_per90_within_position(self):
+        df = pd.DataFrame(0, index=range(5), columns=STAT_FIELDS)
+        df['position'] = ['MF', 'MF', 'MF', 'DF', 'MF']
+        df['minutesPlayed'] = [900, 1800, 900, 900, 45]
+        df['goals'] = [2, 2, 1, 9, 5]
+        df['yellowCards'] = [1, 4, 3, 0, 0]
+
+        per90, percentiles = compute_player_metrics(df)
+
+        self.assertEqual(list(per90['goals'][:4]), [0.2, 0.1, 0.1, 0.9])
+        self.assertEqual(list(percentiles['goals'][:4]), [100.0, 50.0, 50.0, 100.0])
+        # Fewer cards per 90 (0.1, 0.2, 0.3) is the higher percentile.
+        self.assertEqual(list(percentiles['yellowCards'][:3]), [100.0, 66.7, 33.3])
+        # Under MIN_MINUTES: no rates and left out of the pool.
+        self.assertTrue(per90.loc[4].isna().all())
+        self.assertTrue(percentiles.loc[4].isna().all())
+
+
+class IngestTests(TestCase):
+    """get_data against a temporary data directory holding one season."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.data_dir = directory.name
+        patcher = mock.patch.object(get_data, 'DATA_DIR', self.data_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        overrides = override_settings(SNAPSHOT_DIR=self.data_dir, SIMILARITY_DIR=self.data_dir)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        pd.DataFrame({'Team': ['Arsenal'], 'Rank': [1], 'Points': [89]}).to_csv(
+            os.path.join(self.data_dir, 'TEAM_24_25.csv'), index=False
+        )
+        self.write_players(goals=[10, 4])
+
+    def write_players(self, goals):
+        pd.DataFrame({
+            'player id': ['1', '2'],
+            'player': ['Saka', 'Rice'],
+            'team': ['Arsenal', 'Arsenal'],
+            'position': ['FW', 'MF'],
+            'minutesPlayed': [2700, 3000],
+            'goals': goals,
+        }).to_csv(os.path.join(self.data_dir, 'EPL_24_25.csv'), index=False)
+
+    def ingest(self) -> str:
+        stdout = StringIO()
+        call_command('get_data', season=SEASON, stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def updated_at(self):
+        return dict(Player.objects.values_list('player_id', 'updated_at'))
+
+    def test_only_changed_rows_are_written(self):
+        self.assertIn('Ingested 2 changed of 2 players', self.ingest())
+        self.assertEqual(IngestManifest.objects.count(), 2)
+        before = self.updated_at()
+
+        self.write_players(goals=[11, 4])
+        self.assertIn('Ingested 1 changed of 2 players', self.ingest())
+        after = self.updated_at()
+        self.assertNotEqual(after['1'], before['1'])
+        self.assertEqual(after['2'], before['2'])
+        self.assertEqual(Player.objects.get(player_id='1').goals, 11)
+
+    def test_unchanged_files_are_skipped(self):
+        self.ingest()
+        before = self.updated_at()
+        self.assertIn('unchanged since last ingest, skipping', self.ingest())
+        self.assertEqual(self.updated_at(), before)
+
+
+class CareerRollupTests(TestCase):
+    def test_rebuild_removes_careers_of_deleted_players(self):
+        team = Team.objects.create(season=SEASON, team_name='Arsenal')
+        Player.objects.create(season=SEASON, player_id='1', name='Gone', team=team, position='FW')
+        self.assertEqual(rebuild_careers(['1']), 1)
+
+        Player.objects.filter(player_id='1').delete()
+        self.assertEqual(rebuild_careers(['1']), 0)
+        self.assertFalse(PlayerCareer.objects.filter(player_id='1').exists())
+
+
+class SimilarityIndexTests(TestCase):
+    def test_missing_index_is_built_in_memory_not_written(self):
+        team = Team.objects.create(season=SEASON, team_name='Arsenal')
+        for n in range(3):
+            Player.objects.create(
+                season=SEASON, player_id=str(n), name=f'Player {n}', team=team,
+                position='MF', minutesPlayed=900, goals=n,
+            )
+
+        # The in-memory build is kept per process; don't leak it into other tests.
+        self.addCleanup(_loaded.pop, SEASON, None)
+        with tempfile.TemporaryDirectory() as directory, override_settings(SIMILARITY_DIR=directory):
+            index = load_similarity_index(SEASON)
+            self.assertEqual(len(index), 3)
+            self.assertEqual(os.listdir(directory), [])
+
+
+    def test_similar_ranks_positional_peers(self):
+        team = Team.objects.create(season=SEASON, team_name='Arsenal')
+        players = {
+            name: Player.objects.create(
+                season=SEASON, player_id=name, name=name, team=team, position=position,
+                minutesPlayed=minutes, goals=goals, assists=assists,
+            )
+            for name, position, minutes, goals, assists in [
+                ('a', 'MF', 900, 10, 8), ('b', 'MF', 900, 9, 7), ('c', 'MF', 900, 0, 0),
+                ('fw', 'FW', 900, 10, 8), ('sub', 'MF', 30, 1, 0),
+            ]
+        }
+        self.addCleanup(_loaded.pop, SEASON, None)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(SIMILARITY_DIR=directory):
+            for metric in ['cosine', 'euclidean']:
+                with self.subTest(metric=metric):
+                    response = self.client.get(f"/api/players/{players['a'].pk}/similar/?metric={metric}")
+                    self.assertEqual([row['name'] for row in response.json()], ['b', 'c'])
+
+            self.assertEqual(self.client.get(f"/api/players/{players['sub'].pk}/similar/").status_code, 404)
+            self.assertEqual(self.client.get(f"/api/players/{players['a'].pk}/similar/?metric=l1").status_code, 400)
+
+
+class CompareTests(TestCase):
+    def test_players_come_back_in_request_order_with_season_radar(self):
+        team = Team.objects.create(season=SEASON, team_name='Arsenal')
+        players = [
+            Player.objects.create(
+                season=SEASON, player_id=str(n), name=f'Player {n}', team=team, position='FW',
+                minutesPlayed=minutes, goals=goals,
+            )
+            for n, (minutes, goals) in enumerate([(900, 2), (1800, 6), (0, 0)])
+        ]
+        ids = ','.join(str(pk) for pk in [players[1].pk, 999999, players[0].pk, players[2].pk])
+
+        data = self.client.get(f'/api/compare/?ids={ids}&type=offensive').json()
+        self.assertEqual(data['type'], 'offensive')
+        self.assertEqual([row['name'] for row in data['players']], ['Player 1', 'Player 0', 'Player 2'])
+        self.assertEqual([row['per90']['goals'] for row in data['players']], [0.3, 0.2, None])
+        # Scaled between the season's smallest and largest non-zero values.
+        self.assertEqual([row['radar']['goals'] for row in data['players']], [100.0, 0.0, 0.0])
+
+    def test_bad_requests(self):
+        for query in ['ids=1&type=magic', 'ids=', 'ids=a,b']:
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/compare/?{query}').status_code, 400)
+
+
+@mock.patch.object(exports, 'CHUNK_SIZE', 2)
+class ExportTests(TestCase):
+    """Exports with two rows per chunk, so every format spans several chunks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for season in ['2022-23', '2023-24', '2024-25']:
+            team = Team.objects.create(season=season, team_name='Arsenal')
+            for n in range(3):
+                Player.objects.create(
+                    season=season, player_id=f'{n}', name=f'Player {n}', team=team,
+                    position='MF', goals=n, expectedGoals=n / 2,
+                )
+
+    def export(self, export_format, query):
+        response = self.client.get(f'/api/export/players.{export_format}?{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], exports.EXPORT_CONTENT_TYPES[export_format])
+        return b''.join(response.streaming_content)
+
+    def test_csv(self):
+        content = self.export('csv', 'season_from=2023-24&fields=season,player_id,goals')
+        lines = content.decode().splitlines()
+        self.assertEqual(lines[0], 'season,player_id,goals')
+        self.assertEqual(lines[1:], [f'{season},{n},{n}' for season in ['2023-24', '2024-25'] for n in range(3)])
+
+    def test_ndjson(self):
+        content = self.export('ndjson', 'season=2022-23,2024-25&fields=season,name,team_name')
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0], {'season': '2022-23', 'name': 'Player 0', 'team_name': 'Arsenal'})
+        self.assertEqual(rows[-1]['season'], '2024-25')
+
+    def test_arrow(self):
+        content = self.export('arrow', 'season_to=2022-23&fields=player_id,goals,expectedGoals')
+        table = pa.ipc.open_stream(content).read_all()
+        self.assertEqual(table.schema.names, ['player_id', 'goals', 'expectedGoals'])
+        self.assertEqual(table.schema.field('goals').type, pa.int64())
+        self.assertEqual(table.column('expectedGoals').to_pylist(), [0.0, 0.5, 1.0])
+
+    def test_unknown_format_is_404(self):
+        self.assertEqual(self.client.get('/api/export/players.xml').status_code, 404)
+
+
+class TeamHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for season, team_name, points in [
+            ('2024-25', 'Arsenal', 74), ('2023-24', 'Arsenal', 89), ('2023-24', 'Luton Town', 26),
+        ]:
+            Team.objects.create(season=season, team_name=team_name, points=points)
+
+    def setUp(self):
+        response_cache.clear()
+
+    def test_history_is_oldest_first(self):
+        data = self.client.get('/api/teams/Arsenal/history/', HTTP_ACCEPT='application/json').json()
+        self.assertEqual([(row['season'], row['points']) for row in data['seasons']],
+                         [('2023-24', 89), ('2024-25', 74)])
+        self.assertEqual(self.client.get('/api/teams/Nobody/history/').status_code, 404)
+
+    def test_matrix_has_null_where_a_club_was_absent(self):
+        data = self.client.get('/api/teams/history/?metric=points', HTTP_ACCEPT='application/json').json()
+        self.assertEqual(data['seasons'], ['2023-24', '2024-25'])
+        self.assertEqual(data['values'], {'Arsenal': [89, 74], 'Luton Town': [26, None]})
+        self.assertEqual(self.client.get('/api/teams/history/?metric=team_name').status_code, 400)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        response_cache.clear()
+
+    def test_disabled_by_default(self):
+        self.assertEqual(self.client.get('/api/_metrics').status_code, 404)
+        self.assertNotIn('Server-Timing', self.client.get('/api/teams/', HTTP_ACCEPT='application/json'))
+
+    @override_settings(API_METRICS_ENABLED=True)
+    def test_requests_are_recorded_per_route(self):
+        registry.clear()
+        self.addCleanup(registry.clear)
+
+        response = self.client.get('/api/teams/Arsenal/history/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+        response = self.client.get('/api/_metrics')
+        self.assertEqual(response.status_code, 200)
+        lines = response.content.decode().splitlines()
+        labels = '{route="api/teams/<str:team_name>/history/",method="GET"'
+        self.assertIn('# TYPE api_request_duration_seconds histogram', lines)
+        self.assertIn(f'api_request_duration_seconds_bucket{labels},le="+Inf"}} 1', lines)
+        self.assertIn(f'api_request_duration_seconds_count{labels}}} 1', lines)
+        self.assertIn(f'api_requests_total{labels},status="404"}} 1', lines)
+
+
+class SnapshotTests(TestCase):
+    def test_missing_snapshot_is_rendered_not_written(self):
+        team = Team.objects.create(season=SEASON, team_name='Arsenal')
+        Player.objects.create(season=SEASON, player_id='1', name='Player 1', team=team, position='FW')
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(SNAPSHOT_DIR=directory):
+            response = self.client.get(f'/api/seasons/{SEASON}/snapshot/')
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.content)
+            self.assertEqual([row['name'] for row in data['players']], ['Player 1'])
+            self.assertEqual(os.listdir(directory), [])
+
+            self.assertEqual(self.client.get('/api/seasons/1999-00/snapshot/').status_code, 404)
+
+
+def load_scraper():
+    """scraper.py lives at the repository root, outside the Django project."""
+    spec = importlib.util.spec_from_file_location('scraper', settings.BASE_DIR.parent / 'scraper.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+scraper = load_scraper()
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep: sleeping advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeSofascore:
+    """Records every request; `failures[position]` requests of a position raise first."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def scrape_player_league_stats(self, season, league, accumulation, positions):
+        position = next(key for key, name in scraper.POSITIONS.items() if [name] == positions)
+        with self.lock:
+            self.calls.append((season, position))
+            if self.failures.get(position):
+                self.failures[position] -= 1
+                raise ConnectionError('transient')
+        return pd.DataFrame({'player id': [f'{position}-1'], 'player': [f'{position} Player']})
+
+
+class ScraperTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        for name in ('monotonic', 'sleep'):
+            patcher = mock.patch(f'time.{name}', getattr(self.clock, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint_dir = directory.name
+
+    def scrape(self, ss, **kwargs):
+        with mock.patch('builtins.print'):
+            return scraper.scrape_positions(ss, ['24/25'], checkpoint_dir=self.checkpoint_dir, **kwargs)
+
+    def test_transient_error_is_retried(self):
+        ss = FakeSofascore(failures={'GK': 1})
+        self.assertEqual(self.scrape(ss, workers=1), {})
+        self.assertEqual(ss.calls.count(('24/25', 'GK')), 2)
+        self.assertEqual(len(os.listdir(self.checkpoint_dir)), len(scraper.POSITIONS))
+
+    def test_job_fails_after_its_attempts(self):
+        ss = FakeSofascore(failures={'GK': 5})
+        failed = self.scrape(ss, workers=1, attempts=2)
+        self.assertEqual(list(failed), [('24/25', 'GK')])
+        self.assertIsInstance(failed[('24/25', 'GK')], ConnectionError)
+        self.assertFalse(os.path.exists(scraper.checkpoint_path('24/25', 'GK', self.checkpoint_dir)))
+
+    def test_token_bucket_spaces_requests(self):
+        ss = FakeSofascore()
+        self.scrape(ss, workers=1, rate=2.0)
+        # The first request uses the initial token; each later one waits 1 / rate.
+        self.assertEqual(len(ss.calls), 4)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 1.5)
+        self.assertTrue(all(seconds == 0.5 for seconds in self.clock.sleeps))
+
+    def test_resume_skips_checkpointed_positions(self):
+        done = pd.DataFrame({'player id': ['kept']})
+        done.to_pickle(scraper.checkpoint_path('24/25', 'GK', self.checkpoint_dir))
+        ss = FakeSofascore()
+        self.scrape(ss, workers=2)
+        self.assertNotIn(('24/25', 'GK'), ss.calls)
+        self.assertEqual(sorted(position for _, position in ss.calls), ['DF', 'FW', 'MF'])
+        frames = scraper.load_checkpoints('24/25', self.checkpoint_dir)
+        self.assertEqual(list(frames['GK']['player id']), ['kept'])
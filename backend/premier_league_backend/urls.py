@@ -1,13 +1,32 @@
 from django.contrib import admin
 from rest_framework.routers import DefaultRouter
-from .views import TeamViewSet, PlayerViewSet
+from . import async_views
+from .views import (
+    TeamViewSet, PlayerViewSet, LeaderboardViewSet, PlayerMetricsViewSet,
+    api_metrics, cache_stats, compare, export_players_view, player_career, season_snapshot, team_history,
+    team_history_matrix,
+)
 from django.urls import path, include
 
 router = DefaultRouter()
 router.register(r'teams', TeamViewSet, basename='team')
 router.register(r'players', PlayerViewSet, basename='player')
+router.register(r'player-metrics', PlayerMetricsViewSet, basename='player-metrics')
+router.register(r'leaderboards', LeaderboardViewSet, basename='leaderboard')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/_cache/', cache_stats),
+    path('api/_metrics', api_metrics),
+    path('api/seasons/<str:season>/snapshot/', season_snapshot),
+    path('api/compare/', compare),
+    path('api/export/players.<str:export_format>', export_players_view),
+    path('api/players/<str:player_id>/career/', player_career),
+    path('api/teams/history/', team_history_matrix),
+    path('api/teams/<str:team_name>/history/', team_history),
+    # Async JSON reads; other methods and the browsable API fall through to the viewsets.
+    path('api/teams/', async_views.teams),
+    path('api/players/', async_views.players),
+    path('api/leaderboards/', async_views.leaderboards),
     path('api/', include(router.urls)),
 ]
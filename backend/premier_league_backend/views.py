@@ -1,27 +1,468 @@
-from rest_framework import viewsets, filters
-from .models import Team, Player
-from .serializers import TeamSerializer, PlayerSerializer
+import gzip
+import os
 
+from django.db import models
+from django.db.models import F
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import viewsets, filters, mixins
+from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .cache import SeasonCacheMixin, all_seasons_version, response_cache, serve_cached
+from .filtering import RangeFilter
+from .models import Team, Player, PlayerCareer, PlayerMetrics
+from .serializers import (
+    TeamSerializer, PlayerSerializer, PlayerCareerSerializer, PlayerMetricsSerializer,
+    PlayerValuesSerializer,
+)
+from .pagination import KeysetPagination
+from .profiling import metrics_enabled, render_metrics, serializing
+from .comparison import COMPARISON_METRICS, compare_players
+from .exports import EXPORT_CONTENT_TYPES, export_players, export_queryset, streaming_content
+from .search import search_player_ids
+from .similarity import nearest_players
+from .snapshots import build_snapshot, snapshot_path
 
-class TeamViewSet(viewsets.ModelViewSet):
+
+NUMERIC_PLAYER_FIELDS = {
+    field.name for field in Player._meta.concrete_fields
+    if isinstance(field, (models.IntegerField, models.FloatField)) and not field.primary_key
+}
+PLAYER_SUMMARY_FIELDS = ['id', 'player_id', 'name', 'team_name', 'position', 'season']
+
+
+def requested_player_fields(request):
+    """Parse ?fields=name,goals,... into known serializer fields, or None for all."""
+    return parse_player_fields(request.query_params.get('fields'))
+
+
+def parse_player_fields(requested):
+    if not requested:
+        return None
+    known = {field.name for field in Player._meta.concrete_fields} | {'team_name'}
+    fields = [name for name in requested.split(',') if name in known]
+    return fields or None
+
+
+class TeamViewSet(SeasonCacheMixin, viewsets.ModelViewSet):
     serializer_class = TeamSerializer
 
     def get_queryset(self):
-        queryset = Team.objects.all()
+        queryset = Team.objects.select_related('aggregates')
         season = self.request.query_params.get('season', '2024-25')
         if season:
             queryset = queryset.filter(season=season)
         return queryset.order_by('rank')  # Changed from -points to rank
 
 
-class PlayerViewSet(viewsets.ModelViewSet):
+class PlayerViewSet(SeasonCacheMixin, viewsets.ModelViewSet):
+    """Season players, keyset-paginated.
+
+    /api/players/?season=2024-25&ordering=-assists&minutesPlayed__gte=900&page_size=25
+    then follow `next`/`previous`. Ties in the ordering break on player_id.
+    """
+
     serializer_class = PlayerSerializer
-    filter_backends = [filters.SearchFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [filters.SearchFilter, RangeFilter, filters.OrderingFilter]
     search_fields = ['name', 'team__team_name']
+    range_fields = NUMERIC_PLAYER_FIELDS
+    ordering_fields = sorted(NUMERIC_PLAYER_FIELDS) + ['name', 'position', 'team__team_name']
+    ordering = ['-goals']
+
+    def get_requested_fields(self):
+        return requested_player_fields(self.request)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def page_query(self):
+        """(serializer, queryset, hidden) for one page of the JSON fast path.
+
+        Nothing is fetched yet, so the async views can share it. Key columns
+        the client did not ask for are in `hidden`: fetched for the cursor,
+        then dropped again by render_page().
+        """
+        paginator = self.paginator
+        fields = self.get_requested_fields()
+        queryset = paginator.page_queryset(self.filter_queryset(self.get_queryset()), self.request, self)
+
+        names = PlayerValuesSerializer(fields).names
+        hidden = [name for name in paginator.key_fields() if name not in names]
+        return PlayerValuesSerializer(fields, extra=hidden), queryset, hidden
+
+    def render_page(self, rows, hidden) -> bytes:
+        paginator = self.paginator
+        rows = paginator.paginate_rows(rows)
+        for row in rows:
+            for name in hidden:
+                del row[name]
+        return PlayerValuesSerializer.dumps(paginator.get_paginated_data(rows))
+
+    def uncached_list(self, request, *args, **kwargs):
+        # JSON clients get rows rendered straight from values_list().
+        serializer, queryset, hidden = self.page_query()
+        self.paginator.count_rows()
+        content = self.render_page(serializer.rows(queryset), hidden)
+        return HttpResponse(content, content_type='application/json')
+
+    @action(detail=False)
+    def search(self, request):
+        """Autocomplete: /api/players/search/?q=odegaard&season=2024-25&limit=10.
+
+        Accent-insensitive prefix matches from the FTS5 index that get_data
+        maintains, best first. Without `season` every season is searched.
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+
+        ids = search_player_ids(
+            request.query_params.get('q', ''), request.query_params.get('season'), limit
+        )
+        serializer = PlayerValuesSerializer(PLAYER_SUMMARY_FIELDS)
+        rows = {row['id']: row for row in serializer.rows(Player.objects.filter(pk__in=ids))}
+        content = serializer.dumps([rows[pk] for pk in ids if pk in rows])
+        return HttpResponse(content, content_type='application/json')
+
+    @action(detail=True)
+    def similar(self, request, pk=None):
+        """Nearest positional peers: /api/players/<id>/similar/?k=10&metric=cosine.
+
+        Looks the player up in its own season's memory-mapped index, whatever
+        ?season says; `metric` is cosine (default) or euclidean.
+        """
+        metric = request.query_params.get('metric', 'cosine')
+        if metric not in ('cosine', 'euclidean'):
+            raise ValidationError({'metric': "Must be 'cosine' or 'euclidean'."})
+        try:
+            k = max(1, min(int(request.query_params.get('k', 10)), 50))
+        except ValueError:
+            raise ValidationError({'k': 'Must be an integer.'})
+
+        season = None
+        if pk.isdigit():
+            season = Player.objects.filter(pk=pk).values_list('season', flat=True).first()
+        if season is None:
+            raise Http404
+        neighbours = nearest_players(season, int(pk), k, metric)
+        if neighbours is None:
+            raise Http404('Player has too few minutes to compare.')
+
+        serializer = PlayerValuesSerializer(PLAYER_SUMMARY_FIELDS)
+        ids = [player_pk for player_pk, _ in neighbours]
+        rows = {row['id']: row for row in serializer.rows(Player.objects.filter(pk__in=ids))}
+        content = serializer.dumps([{**rows[player_pk], 'score': score} for player_pk, score in neighbours])
+        return HttpResponse(content, content_type='application/json')
 
     def get_queryset(self):
-        queryset = Player.objects.all()
+        queryset = Player.objects.select_related('team')
         season = self.request.query_params.get('season', '2024-25')
         if season:
             queryset = queryset.filter(season=season)
+
+        fields = self.get_requested_fields()
+        if fields is not None:
+            columns = {'id'} | {name for name in fields if name != 'team_name'}
+            if 'team_name' in fields:
+                columns |= {'team', 'team__team_name'}
+            else:
+                queryset = queryset.select_related(None)
+            queryset = queryset.only(*columns)
+
         return queryset.order_by('-goals')
+
+
+DERIVED_PLAYER_METRICS = {
+    'goal_contributions': F('goals') + F('assists'),
+    'defensive_actions': F('tackles') + F('interceptions') + F('clearances'),
+}
+LEADERBOARD_FIELDS = ['player_id', 'name', 'team_name', 'position', 'appearances', 'minutesPlayed']
+
+
+class LeaderboardViewSet(SeasonCacheMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Top players of a season by one metric.
+
+    /api/leaderboards/?season=2024-25&metric=goals&limit=10&position=FW&team=Arsenal
+
+    `metric` is any numeric Player field or a key of DERIVED_PLAYER_METRICS.
+    The ORDER BY ... LIMIT runs in the database; goals, assists and
+    goal_contributions are covered by (season, metric, player_id) indexes.
+    Ties break on player_id (KeysetPagination.tiebreak), not the row id, so
+    a leaderboard lists tied players in the same order as the players list.
+    """
+
+    serializer_class = PlayerSerializer
+    default_limit = 10
+    max_limit = 100
+
+    def get_metric(self):
+        metric = self.request.query_params.get('metric', 'goals')
+        if metric not in NUMERIC_PLAYER_FIELDS and metric not in DERIVED_PLAYER_METRICS:
+            raise ValidationError({'metric': f"Unknown metric '{metric}'."})
+        return metric
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        return max(1, min(limit, self.max_limit))
+
+    def get_queryset(self):
+        params = self.request.query_params
+        metric = self.get_metric()
+
+        queryset = Player.objects.select_related('team').filter(
+            season=params.get('season', self.default_season)
+        )
+        if params.get('position'):
+            queryset = queryset.filter(position=params['position'])
+        if params.get('team'):
+            queryset = queryset.filter(team__team_name=params['team'])
+        if metric in DERIVED_PLAYER_METRICS:
+            queryset = queryset.annotate(**{metric: DERIVED_PLAYER_METRICS[metric]})
+            ordering = DERIVED_PLAYER_METRICS[metric].desc()
+        else:
+            ordering = F(metric).desc()
+
+        return queryset.order_by(ordering, KeysetPagination.tiebreak)[:self.get_limit()]
+
+    def get_values_serializer(self):
+        metric = self.get_metric()
+        fields = requested_player_fields(self.request) or LEADERBOARD_FIELDS
+        if metric in DERIVED_PLAYER_METRICS:
+            return PlayerValuesSerializer(fields, extra=[metric])
+        return PlayerValuesSerializer(fields + [metric] if metric not in fields else fields)
+
+    def uncached_list(self, request, *args, **kwargs):
+        content = self.get_values_serializer().render(self.get_queryset())
+        return HttpResponse(content, content_type='application/json')
+
+
+class PlayerMetricsViewSet(SeasonCacheMixin, viewsets.ReadOnlyModelViewSet):
+    """Precomputed per-90 rates and per-position percentiles.
+
+    /api/player-metrics/?season=2024-25&ids=12,34 for a comparison, or
+    &position=DF for a whole pool. `ids` are Player primary keys.
+    """
+
+    serializer_class = PlayerMetricsSerializer
+    lookup_field = 'player'
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = PlayerMetrics.objects.select_related('player').filter(
+            season=params.get('season', self.default_season)
+        )
+        if params.get('position'):
+            queryset = queryset.filter(position=params['position'])
+        if params.get('ids'):
+            try:
+                ids = [int(pk) for pk in params['ids'].split(',')]
+            except ValueError:
+                raise ValidationError({'ids': 'Must be comma-separated integers.'})
+            queryset = queryset.filter(player__in=ids)
+        return queryset.order_by('player')
+
+
+@api_view(['GET'])
+def cache_stats(request):
+    return Response(response_cache.stats())
+
+
+def api_metrics(request):
+    """Prometheus scrape target for MetricsMiddleware; 404 unless API_METRICS_ENABLED.
+
+    Metrics are per process: scrape each worker, or run a single one.
+    """
+    if not metrics_enabled():
+        raise Http404
+    return HttpResponse(
+        render_metrics(response_cache.stats()), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+NUMERIC_TEAM_FIELDS = {
+    field.name for field in Team._meta.concrete_fields
+    if isinstance(field, (models.IntegerField, models.FloatField)) and not field.primary_key
+}
+TEAM_HISTORY_FIELDS = [
+    'season', 'rank', 'points', 'matches_played', 'wins', 'draws', 'losses',
+    'goals_for', 'goals_against', 'goal_difference',
+]
+
+
+def cached_history(request, build):
+    """Serve a cross-season response from response_cache until the next ingest.
+
+    `build` returns the response data, or None for a 404.
+    """
+    if request.accepted_renderer.format != 'json':
+        data = build()
+        if data is None:
+            raise Http404
+        return Response(data)
+
+    version, updated_at = all_seasons_version()
+    key = ('team-history', request.path, version, tuple(sorted(request.query_params.items())))
+
+    def render():
+        with serializing():
+            data = build()
+            if data is None:
+                return None
+            return request.accepted_renderer.render(data), request.accepted_renderer.media_type
+
+    response = serve_cached(request, key, updated_at, render)
+    if response is None:
+        raise Http404
+    return response
+
+
+@api_view(['GET'])
+def team_history(request, team_name):
+    """One club's season-by-season record, oldest first, from a single query."""
+    def build():
+        rows = list(
+            Team.objects.filter(team_name=team_name).order_by('season').values(*TEAM_HISTORY_FIELDS)
+        )
+        return {'team_name': team_name, 'seasons': rows} if rows else None
+
+    return cached_history(request, build)
+
+
+@api_view(['GET'])
+def team_history_matrix(request):
+    """Seasons x teams pivot of one metric: /api/teams/history/?metric=points.
+
+    `values[team]` lines up with `seasons`, with null where the club was
+    not in the league. One query, pivoted in Python.
+    """
+    metric = request.query_params.get('metric', 'points')
+    if metric not in NUMERIC_TEAM_FIELDS:
+        raise ValidationError({'metric': f"Unknown metric '{metric}'."})
+
+    def build():
+        rows = list(Team.objects.values_list('team_name', 'season', metric))
+        seasons = sorted({season for _, season, _ in rows})
+        column = {season: index for index, season in enumerate(seasons)}
+        values = {}
+        for team_name, season, value in rows:
+            values.setdefault(team_name, [None] * len(seasons))[column[season]] = value
+        return {'metric': metric, 'seasons': seasons, 'values': dict(sorted(values.items()))}
+
+    return cached_history(request, build)
+
+
+@api_view(['GET'])
+def compare(request):
+    """Batch comparison: /api/compare/?ids=12,34,56&type=offensive.
+
+    Up to 50 Player primary keys, returned in the order given, each with
+    raw, per-90 and season-normalized radar values for the type's metrics.
+    """
+    kind = request.query_params.get('type', 'offensive')
+    if kind not in COMPARISON_METRICS:
+        raise ValidationError({'type': f"Must be one of {', '.join(COMPARISON_METRICS)}."})
+    try:
+        ids = [int(pk) for pk in request.query_params.get('ids', '').split(',') if pk]
+    except ValueError:
+        raise ValidationError({'ids': 'Must be comma-separated integers.'})
+    if not 1 <= len(ids) <= 50:
+        raise ValidationError({'ids': 'Give between 1 and 50 player ids.'})
+
+    return Response({
+        'type': kind,
+        'metrics': COMPARISON_METRICS[kind],
+        'players': compare_players(ids, kind),
+    })
+
+
+@api_view(['GET'])
+def player_career(request, player_id):
+    """Cross-season rollup for a Sofascore player_id, read from PlayerCareer in one query."""
+    career = get_object_or_404(PlayerCareer, player_id=player_id)
+    return Response(PlayerCareerSerializer(career).data)
+
+
+def season_snapshot(request, season):
+    """Stream the precompressed teams+players snapshot written by get_data.
+
+    The stored bytes are sent as-is with the matching Content-Encoding;
+    clients that accept neither brotli nor gzip get it decompressed on the fly.
+    A season get_data hasn't written a snapshot for yet is rendered in
+    memory for each request; requests never write the file.
+    """
+    path = snapshot_path(season, 'gzip')
+    if not os.path.exists(path):
+        return unstored_snapshot(request, season)
+
+    stat = os.stat(path)
+    etag = f'W/"{season}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        brotli_path = snapshot_path(season, 'br')
+        if 'br' in accept_encoding and os.path.exists(brotli_path):
+            response = FileResponse(open(brotli_path, 'rb'), content_type='application/json')
+            response['Content-Encoding'] = 'br'
+        elif 'gzip' in accept_encoding:
+            response = FileResponse(open(path, 'rb'), content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = FileResponse(gzip.open(path, 'rb'), content_type='application/json')
+        del response['Content-Disposition']
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def unstored_snapshot(request, season):
+    if not Team.objects.filter(season=season).exists():
+        raise Http404(f"No data for season {season}")
+
+    content = build_snapshot(season)
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(gzip.compress(content), content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(content, content_type='application/json')
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def export_players_view(request, export_format):
+    """Bulk player export: /api/export/players.<ndjson|csv|arrow>.
+
+    ?season=2023-24,2024-25 and/or ?season_from=2015-16&season_to=2019-20
+    select seasons (all of them by default); ?fields= works as on the
+    players list. Rows stream in (season, player_id) order from a chunked
+    cursor, so memory stays flat however many seasons are requested.
+    """
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise Http404(f"Unknown export format '{export_format}'")
+
+    params = request.GET
+    seasons = [season for season in params.get('season', '').split(',') if season]
+    queryset = export_queryset(seasons, params.get('season_from'), params.get('season_to'))
+    chunks = export_players(export_format, queryset, parse_player_fields(params.get('fields')))
+
+    response = StreamingHttpResponse(
+        streaming_content(request, chunks), content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="players.{export_format}"'
+    return response
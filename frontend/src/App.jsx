@@ -24,16 +24,14 @@ function App() {
         setLoading(true);
         setError(null);
 
-        const [teamsRes, playersRes] = await Promise.all([
-          axios.get(`/teams/?season=${selectedSeason}`),
-          axios.get(`/players/?season=${selectedSeason}`),
-        ]);
+        // One precompressed snapshot with the season's teams and players.
+        const { data } = await axios.get(`/seasons/${selectedSeason}/snapshot/`);
 
-        setTeams(teamsRes.data);
-        setPlayers(playersRes.data);
+        setTeams(data.teams);
+        setPlayers(data.players);
 
-        if (playersRes.data.length > 0) {
-          const top = [...playersRes.data].sort(
+        if (data.players.length > 0) {
+          const top = [...data.players].sort(
             (a, b) => (b.goals || 0) - (a.goals || 0)
           )[0];
           setSelectedPlayer(top);
@@ -161,11 +159,11 @@ function App() {
                 </div>
               </div>
             )}
-            {activeTab === "players" && <PlayerTable players={players} />}
+            {activeTab === "players" && <PlayerTable players={players} season={selectedSeason} />}
 
             {activeTab === "comparison" && (
               <div className="p-8">
-                <ComparisonView players={players} teams={teams} />
+                <ComparisonView players={players} teams={teams} season={selectedSeason} />
               </div>
             )}
 
@@ -1,4 +1,5 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useEffect } from 'react';
+import axios from 'axios';
 import { Search, TrendingUp, TrendingDown, Award, Activity, ChevronDown } from 'lucide-react';
 import {
     RadarChart, Radar, PolarGrid, PolarAngleAxis, PolarRadiusAxis,
@@ -7,7 +8,25 @@ import {
     PieChart, Pie
 } from 'recharts';
 
-const ComparisonView = ({ players, teams }) => {
+// Autocomplete hits come from the server-side search index.
+const usePlayerSearch = (query, season, players) => {
+    const [results, setResults] = useState([]);
+
+    useEffect(() => {
+        if (!query) return;
+        const timer = setTimeout(() => {
+            axios
+                .get('/players/search/', { params: { q: query, season, limit: 50 } })
+                .then(({ data }) => setResults(data))
+                .catch(err => console.error('Error searching players:', err));
+        }, 150);
+        return () => clearTimeout(timer);
+    }, [query, season]);
+
+    return query ? results : players.slice(0, 50);
+};
+
+const ComparisonView = ({ players, teams, season }) => {
     const [player1Search, setPlayer1Search] = useState('');
     const [player2Search, setPlayer2Search] = useState('');
     const [player1Id, setPlayer1Id] = useState('');
@@ -19,21 +38,23 @@ const ComparisonView = ({ players, teams }) => {
     const p1 = players.find(p => (p.id || p.player_id) == player1Id);
     const p2 = players.find(p => (p.id || p.player_id) == player2Id);
 
-    const filteredPlayers1 = useMemo(() => {
-        if (!player1Search) return players.slice(0, 50);
-        return players.filter(p =>
-            p.name.toLowerCase().includes(player1Search.toLowerCase()) ||
-            (p.team_name && p.team_name.toLowerCase().includes(player1Search.toLowerCase()))
-        ).slice(0, 50);
-    }, [players, player1Search]);
+    // Raw, per-90 and radar values for both players come from one batch request.
+    const [comparison, setComparison] = useState({});
+
+    useEffect(() => {
+        const ids = [p1?.id, p2?.id].filter(Boolean);
+        if (ids.length === 0) return;
+        axios
+            .get('/compare/', { params: { ids: ids.join(','), type: comparisonType } })
+            .then(({ data }) => setComparison(Object.fromEntries(data.players.map(p => [p.id, p]))))
+            .catch(err => console.error('Error fetching comparison:', err));
+    }, [p1?.id, p2?.id, comparisonType]);
 
-    const filteredPlayers2 = useMemo(() => {
-        if (!player2Search) return players.slice(0, 50);
-        return players.filter(p =>
-            p.name.toLowerCase().includes(player2Search.toLowerCase()) ||
-            (p.team_name && p.team_name.toLowerCase().includes(player2Search.toLowerCase()))
-        ).slice(0, 50);
-    }, [players, player2Search]);
+    const radarScore = (player, key) => comparison[player?.id]?.radar?.[key] ?? 0;
+    const per90 = (player, key) => comparison[player?.id]?.per90?.[key] ?? 0;
+
+    const filteredPlayers1 = usePlayerSearch(player1Search, season, players);
+    const filteredPlayers2 = usePlayerSearch(player2Search, season, players);
 
     const metricsByType = {
         offensive: [
@@ -65,26 +86,15 @@ const ComparisonView = ({ players, teams }) => {
 
         const metrics = metricsByType[comparisonType];
 
-        return metrics.map(metric => {
-            const values = players.map(p => parseFloat(p[metric.key]) || 0).filter(v => v > 0);
-            const min = values.length > 0 ? Math.min(...values) : 0;
-            const max = values.length > 0 ? Math.max(...values) : 1;
-
-            const normalizeValue = (val) => {
-                if (max === min) return 50;
-                return ((val - min) / (max - min)) * 100;
-            };
-
-            return {
-                subject: metric.label,
-                fullMark: 100,
-                player1: p1 ? normalizeValue(parseFloat(p1[metric.key]) || 0) : 0,
-                player2: p2 ? normalizeValue(parseFloat(p2[metric.key]) || 0) : 0,
-                val1: p1 ? (parseFloat(p1[metric.key]) || 0) : 0,
-                val2: p2 ? (parseFloat(p2[metric.key]) || 0) : 0,
-            };
-        });
-    }, [p1, p2, players, comparisonType]);
+        return metrics.map(metric => ({
+            subject: metric.label,
+            fullMark: 100,
+            player1: p1 ? radarScore(p1, metric.key) : 0,
+            player2: p2 ? radarScore(p2, metric.key) : 0,
+            val1: p1 ? (parseFloat(p1[metric.key]) || 0) : 0,
+            val2: p2 ? (parseFloat(p2[metric.key]) || 0) : 0,
+        }));
+    }, [p1, p2, comparison, comparisonType]);
 
     const barChartData = useMemo(() => {
         if (!p1 || !p2) return [];
@@ -118,32 +128,29 @@ const ComparisonView = ({ players, teams }) => {
     const per90Data = useMemo(() => {
         if (!p1 || !p2) return [];
         
-        const calc90 = (player, stat) => {
-            const minutes = player.minutesPlayed || 1;
-            return ((stat / minutes) * 90).toFixed(2);
-        };
+        const row = (stat, key) => ({ stat, player1: per90(p1, key), player2: per90(p2, key) });
 
         if (comparisonType === 'offensive') {
             return [
-                { stat: 'Goals/90', player1: parseFloat(calc90(p1, p1.goals || 0)), player2: parseFloat(calc90(p2, p2.goals || 0)) },
-                { stat: 'Assists/90', player1: parseFloat(calc90(p1, p1.assists || 0)), player2: parseFloat(calc90(p2, p2.assists || 0)) },
-                { stat: 'Shots/90', player1: parseFloat(calc90(p1, p1.totalShots || 0)), player2: parseFloat(calc90(p2, p2.totalShots || 0)) },
+                row('Goals/90', 'goals'),
+                row('Assists/90', 'assists'),
+                row('Shots/90', 'totalShots'),
             ];
         } else if (comparisonType === 'defensive') {
             return [
-                { stat: 'Tackles/90', player1: parseFloat(calc90(p1, p1.tackles || 0)), player2: parseFloat(calc90(p2, p2.tackles || 0)) },
-                { stat: 'Interceptions/90', player1: parseFloat(calc90(p1, p1.interceptions || 0)), player2: parseFloat(calc90(p2, p2.interceptions || 0)) },
-                { stat: 'Clearances/90', player1: parseFloat(calc90(p1, p1.clearances || 0)), player2: parseFloat(calc90(p2, p2.clearances || 0)) },
-                { stat: 'Duels Won/90', player1: parseFloat(calc90(p1, p1.totalDuelsWon || 0)), player2: parseFloat(calc90(p2, p2.totalDuelsWon || 0)) },
+                row('Tackles/90', 'tackles'),
+                row('Interceptions/90', 'interceptions'),
+                row('Clearances/90', 'clearances'),
+                row('Duels Won/90', 'totalDuelsWon'),
             ];
         } else {
             return [
-                { stat: 'Saves/90', player1: parseFloat(calc90(p1, p1.saves || 0)), player2: parseFloat(calc90(p2, p2.saves || 0)) },
-                { stat: 'Claims/90', player1: parseFloat(calc90(p1, p1.highClaims || 0)), player2: parseFloat(calc90(p2, p2.highClaims || 0)) },
-                { stat: 'Runs Out/90', player1: parseFloat(calc90(p1, p1.runsOut || 0)), player2: parseFloat(calc90(p2, p2.runsOut || 0)) },
+                row('Saves/90', 'saves'),
+                row('Claims/90', 'highClaims'),
+                row('Runs Out/90', 'runsOut'),
             ];
         }
-    }, [p1, p2, comparisonType]);
+    }, [p1, p2, comparison, comparisonType]);
 
     const efficiencyData = useMemo(() => {
         if (!p1 || !p2) return [];
@@ -1,10 +1,30 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
 import { PieChart, Pie, Cell, Tooltip, ResponsiveContainer, BarChart, Bar, XAxis, YAxis, CartesianGrid, Legend, RadarChart, Radar, PolarGrid, PolarAngleAxis, PolarRadiusAxis } from 'recharts';
 import { Trophy, TrendingUp, Award } from 'lucide-react';
 
 const LeagueOverview = ({ players = [], teams = [], season }) => {
   const [hoveredTeam, setHoveredTeam] = useState(null);
   const [hoverPosition, setHoverPosition] = useState({ x: 0, y: 0 });
+  const [leaderboards, setLeaderboards] = useState({ goals: [], assists: [], goal_contributions: [] });
+
+  // Top-N lists are ranked server-side; only the rows shown are fetched.
+  useEffect(() => {
+    const fetchLeaderboard = (metric, limit) =>
+      axios
+        .get('/leaderboards/', { params: { season, metric, limit, fields: 'player_id,name,team_name,goals,assists' } })
+        .then(({ data }) => data);
+
+    Promise.all([
+      fetchLeaderboard('goals', 10),
+      fetchLeaderboard('assists', 10),
+      fetchLeaderboard('goal_contributions', 8),
+    ])
+      .then(([goals, assists, goal_contributions]) =>
+        setLeaderboards({ goals, assists, goal_contributions }))
+      .catch(err => console.error('Error fetching leaderboards:', err));
+  }, [season]);
+
   const leagueStats = {
     totalGoals: teams.reduce((sum, team) => sum + (team.goals_for || 0), 0),
     totalMatches: teams.reduce((sum, team) => sum + (team.matches_played || 0), 0) / 2,
@@ -15,13 +35,8 @@ const LeagueOverview = ({ players = [], teams = [], season }) => {
     totalPlayers: players.length,
   };
 
-  const topScorers = [...players]
-    .sort((a, b) => (b.goals || 0) - (a.goals || 0))
-    .slice(0, 10);
-
-  const topAssisters = [...players]
-    .sort((a, b) => (b.assists || 0) - (a.assists || 0))
-    .slice(0, 10);
+  const topScorers = leaderboards.goals;
+  const topAssisters = leaderboards.assists;
 
   const resultsDistribution = teams.reduce((acc, team) => {
     acc.wins += team.wins || 0;
@@ -45,13 +60,7 @@ const LeagueOverview = ({ players = [], teams = [], season }) => {
     return gdB - gdA;
   });
 
-  const topContributors = [...players]
-    .map(p => ({
-      ...p,
-      contributions: (p.goals || 0) + (p.assists || 0)
-    }))
-    .sort((a, b) => b.contributions - a.contributions)
-    .slice(0, 8);
+  const topContributors = leaderboards.goal_contributions;
 
   const contributorsChartData = topContributors.map(p => ({
     name: p.name?.split(' ').pop() || 'Unknown',
@@ -66,11 +75,10 @@ const LeagueOverview = ({ players = [], teams = [], season }) => {
     wins: team.wins || 0,
   }));
 
-  const getTopScorerSeason = (teamName) => {
-    const teamPlayers = players.filter(p => p.team_name === teamName);
-    if (teamPlayers.length === 0) return null;
-    const topPlayer = teamPlayers.sort((a, b) => (b.goals || 0) - (a.goals || 0))[0];
-    return topPlayer ? `${topPlayer.name} (${topPlayer.goals || 0})` : null;
+  // Aggregated per team at ingest, so hovering never scans the roster.
+  const getTopScorerSeason = (team) => {
+    const aggregates = team.aggregates;
+    return aggregates?.top_scorer ? `${aggregates.top_scorer} (${aggregates.top_scorer_goals || 0})` : null;
   };
 
   const PlayerImage = ({ player, size = 'medium' }) => {
@@ -264,7 +272,7 @@ const LeagueOverview = ({ players = [], teams = [], season }) => {
                     <div>
                       <div className="text-gold-100 text-xs mb-1">Top Scorer (Season)</div>
                       <div className="text-white text-sm font-medium">
-                        {getTopScorerSeason(hoveredTeam.team_name) || 'N/A'}
+                        {getTopScorerSeason(hoveredTeam) || 'N/A'}
                       </div>
                     </div>
                     <div>
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import axios from 'axios';
 import { Search, ChevronUp, ChevronDown, ChevronLeft, ChevronRight } from 'lucide-react';
 
 const PlayerImage = ({ player, size = 'medium' }) => {
@@ -47,36 +48,82 @@ const PlayerImage = ({ player, size = 'medium' }) => {
   );
 };
 
-const PlayerTable = ({ players }) => {
+const PlayerTable = ({ players, season }) => {
+  const [searchInput, setSearchInput] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [sortConfig, setSortConfig] = useState({ key: 'goals', direction: 'desc' });
+  const [cursor, setCursor] = useState(null);
   const [currentPage, setCurrentPage] = useState(1);
+  const [page, setPage] = useState({ results: [], next: null, previous: null });
+  const [matchCount, setMatchCount] = useState(null);
+  const [pagedSeason, setPagedSeason] = useState(season);
   const playersPerPage = 15;
 
-  const filteredPlayers = players.filter(
-    (p) =>
-      (p.name || '').toLowerCase().includes(searchTerm.toLowerCase()) ||
-      (p.team_name || '').toLowerCase().includes(searchTerm.toLowerCase())
-  );
+  // A cursor belongs to the season it was issued for; drop it during render,
+  // before the fetch below can send it with the new season.
+  if (season !== pagedSeason) {
+    setPagedSeason(season);
+    setCursor(null);
+    setCurrentPage(1);
+  }
 
-  const sortedPlayers = [...filteredPlayers].sort((a, b) => {
-    const aVal = a[sortConfig.key];
-    const bVal = b[sortConfig.key];
-    if (typeof aVal === 'string') {
-      return sortConfig.direction === 'desc' ? bVal.localeCompare(aVal) : aVal.localeCompare(bVal);
-    }
-    return sortConfig.direction === 'desc' ? (bVal || 0) - (aVal || 0) : (aVal || 0) - (bVal || 0);
-  });
+  // Search once typing pauses rather than on every keystroke.
+  useEffect(() => {
+    if (searchInput === searchTerm) return;
+    const timer = setTimeout(() => {
+      setSearchTerm(searchInput);
+      setCursor(null);
+      setCurrentPage(1);
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [searchInput, searchTerm]);
 
-  const totalPages = Math.ceil(sortedPlayers.length / playersPerPage);
+  // Sorting, searching and paging happen server-side; only one page is fetched.
+  // A newer request aborts the one in flight, so a slow stale page can't win.
+  useEffect(() => {
+    const controller = new AbortController();
+    const ordering = sortConfig.key === 'team_name' ? 'team__team_name' : sortConfig.key;
+    const params = cursor
+      ? {}
+      : {
+          season,
+          search: searchTerm || undefined,
+          ordering: sortConfig.direction === 'desc' ? `-${ordering}` : ordering,
+          page_size: playersPerPage,
+        };
+    axios
+      .get(cursor || '/players/', { params, signal: controller.signal })
+      .then(({ data }) => {
+        setPage(data);
+        // Only first pages carry the number of players matching the filters.
+        if (data.count !== undefined) setMatchCount(data.count);
+      })
+      .catch(err => {
+        if (!axios.isCancel(err)) console.error('Error fetching players:', err);
+      });
+    return () => controller.abort();
+  }, [season, searchTerm, sortConfig, cursor]);
+
+  const currentPlayers = page.results;
+  const playerCount = matchCount ?? players.length;
   const startIndex = (currentPage - 1) * playersPerPage;
-  const currentPlayers = sortedPlayers.slice(startIndex, startIndex + playersPerPage);
+
+  const goToPage = (url, step) => {
+    setCursor(url);
+    setCurrentPage((prev) => prev + step);
+  };
+
+  const resetPaging = () => {
+    setCursor(null);
+    setCurrentPage(1);
+  };
 
   const handleSort = (key) => {
     setSortConfig((prev) => ({
       key,
       direction: prev.key === key && prev.direction === 'desc' ? 'asc' : 'desc',
     }));
+    resetPaging();
   };
 
   const SortIcon = ({ columnKey }) => {
@@ -105,7 +152,7 @@ const PlayerTable = ({ players }) => {
         <div className="mb-6">
           <h1 className="text-2xl font-bold text-gold-600 mb-1">Premier League Player Table</h1>
           <p className="text-gold-100 text-sm">
-            Learn about {sortedPlayers.length} player{sortedPlayers.length !== 1 ? 's' : ''}
+            Learn about {playerCount} player{playerCount !== 1 ? 's' : ''}
           </p>
         </div>
 
@@ -115,11 +162,8 @@ const PlayerTable = ({ players }) => {
           <input
             type="text"
             placeholder="Search players"
-            value={searchTerm}
-            onChange={(e) => {
-              setSearchTerm(e.target.value);
-              setCurrentPage(1);
-            }}
+            value={searchInput}
+            onChange={(e) => setSearchInput(e.target.value)}
             className="w-full pl-10 pr-3 py-2 bg-navy-800 border border-navy-600 rounded text-white placeholder-gold-100 text-sm focus:outline-none focus:border-gold-500"
           />
         </div>
@@ -237,7 +281,7 @@ const PlayerTable = ({ players }) => {
                 ))}
               </tbody>
             </table>
-            {sortedPlayers.length === 0 && (
+            {currentPlayers.length === 0 && (
               <div className="text-center py-12 bg-navy-800">
                 <p className="text-gold-100">No players found</p>
                 <p className="text-bronze-300 text-xs mt-1">Try adjusting your search</p>
@@ -247,50 +291,26 @@ const PlayerTable = ({ players }) => {
         </div>
 
         {/* Pagination */}
-        {totalPages > 1 && (
+        {(page.next || page.previous) && (
           <div className="flex justify-between items-center mt-4 px-1">
             <div className="text-xs text-gold-100">
-              {startIndex + 1}-{Math.min(startIndex + playersPerPage, sortedPlayers.length)} of {sortedPlayers.length}
+              {startIndex + 1}-{startIndex + currentPlayers.length}
             </div>
             <div className="flex items-center gap-1">
               <button
                 className="p-1.5 rounded hover:bg-navy-600 disabled:opacity-40 disabled:cursor-not-allowed transition-colors"
-                disabled={currentPage === 1}
-                onClick={() => setCurrentPage((prev) => prev - 1)}
+                disabled={!page.previous}
+                onClick={() => goToPage(page.previous, -1)}
               >
                 <ChevronLeft size={18} className="text-gold-100" />
               </button>
-              <div className="flex items-center gap-1">
-                {Array.from({ length: Math.min(5, totalPages) }, (_, i) => {
-                  let pageNum;
-                  if (totalPages <= 5) {
-                    pageNum = i + 1;
-                  } else if (currentPage <= 3) {
-                    pageNum = i + 1;
-                  } else if (currentPage >= totalPages - 2) {
-                    pageNum = totalPages - 4 + i;
-                  } else {
-                    pageNum = currentPage - 2 + i;
-                  }
-                  return (
-                    <button
-                      key={pageNum}
-                      onClick={() => setCurrentPage(pageNum)}
-                      className={`min-w-[32px] px-2 py-1.5 rounded text-sm font-medium transition-colors ${
-                        currentPage === pageNum
-                          ? 'bg-gold-500 text-white'
-                          : 'text-gold-100 hover:bg-navy-600'
-                      }`}
-                    >
-                      {pageNum}
-                    </button>
-                  );
-                })}
-              </div>
+              <span className="min-w-[32px] px-2 py-1.5 rounded text-sm font-medium bg-gold-500 text-white text-center">
+                {currentPage}
+              </span>
               <button
                 className="p-1.5 rounded hover:bg-navy-600 disabled:opacity-40 disabled:cursor-not-allowed transition-colors"
-                disabled={currentPage === totalPages}
-                onClick={() => setCurrentPage((prev) => prev + 1)}
+                disabled={!page.next}
+                onClick={() => goToPage(page.next, 1)}
               >
                 <ChevronRight size={18} className="text-gold-100" />
               </button>
@@ -568,6 +568,7 @@ const StatisticsPage = ({ players = [], teams = [] }) => {
     }
 
     const teamPlayers = players.filter(p => p.team_name === team.team_name);
+    const aggregates = team.aggregates || {};
     const matchesPlayed = team.matches_played || 0;
     const goalDiff = (team.goals_for || 0) - (team.goals_against || 0);
     const winRate = matchesPlayed > 0 ? (((team.wins || 0) / matchesPlayed) * 100).toFixed(0) : 0;
@@ -731,9 +732,25 @@ const StatisticsPage = ({ players = [], teams = [] }) => {
               <div>
                 <div className="text-gold-100 text-xs mb-1">Top Scorer (Season)</div>
                 <div className="text-white text-sm font-medium">
-                  {teamPlayers.length > 0 
-                    ? `${teamPlayers.sort((a, b) => (b.goals || 0) - (a.goals || 0))[0].name} (${teamPlayers.sort((a, b) => (b.goals || 0) - (a.goals || 0))[0].goals || 0})`
-                    : 'N/A'}
+                  {aggregates.top_scorer ? `${aggregates.top_scorer} (${aggregates.top_scorer_goals || 0})` : 'N/A'}
+                </div>
+              </div>
+              <div>
+                <div className="text-gold-100 text-xs mb-1">Top Assister (Season)</div>
+                <div className="text-white text-sm font-medium">
+                  {aggregates.top_assister ? `${aggregates.top_assister} (${aggregates.top_assister_assists || 0})` : 'N/A'}
+                </div>
+              </div>
+              <div>
+                <div className="text-gold-100 text-xs mb-1">Expected Goals</div>
+                <div className="text-white text-sm font-medium">
+                  {aggregates.expected_goals != null ? `${aggregates.expected_goals.toFixed(1)} xG from ${aggregates.total_shots || 0} shots` : 'N/A'}
+                </div>
+              </div>
+              <div>
+                <div className="text-gold-100 text-xs mb-1">Squad Usage</div>
+                <div className="text-white text-sm font-medium">
+                  {aggregates.players_used ? `${aggregates.players_used} players, top 11 played ${aggregates.top11_minutes_share}%` : 'N/A'}
                 </div>
               </div>
               <div>
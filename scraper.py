@@ -1,84 +1,169 @@
-import ScraperFC as sfc
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
+from tenacity import Retrying, stop_after_attempt, wait_exponential
+
+sys.path.append("backend")
+from premier_league_backend.columns import (
+    combine_position_frames,
+    content_hash,
+    parquet_path,
+    read_player_csv,
+    write_player_parquet,
+)
 
 seasons = [
     '15/16', '16/17', '17/18', '18/19', '19/20',
     '20/21', '21/22', '22/23', '23/24', '24/25'
 ]
 
+LEAGUE = "England Premier League"
+POSITIONS = {
+    "GK": "Goalkeepers",
+    "DF": "Defenders",
+    "MF": "Midfielders",
+    "FW": "Forwards",
+}
+OUTPUT_DIR = "backend/data/processed"
+CHECKPOINT_DIR = "backend/data/checkpoints"
+
+
 def season_to_filename(season):
     year1, year2 = season.split('/')
     return f"{year1}_{year2}"
 
-ss = sfc.Sofascore()
-
-for season in seasons:
-    print(f"\nProcessing season {season}...")
-    
-    try:
-        df_gk = ss.scrape_player_league_stats(season, "England Premier League", "total", ["Goalkeepers"])
-        df_gk['goalsConceded'] = df_gk['goalsConcededInsideTheBox'] + df_gk['goalsConcededOutsideTheBox']
-        cols = df_gk.columns.tolist()
-        inside_box_index = cols.index('goalsConcededInsideTheBox')
-        cols.remove('goalsConceded')
-        cols.insert(inside_box_index, 'goalsConceded')
-        df_gk = df_gk[cols]
-        df_gk['position'] = 'GK'
-        
-        df_def = ss.scrape_player_league_stats(season, "England Premier League", "total", ["Defenders"])
-        df_def['goalsConcededInsideTheBox'] = 0
-        df_def['goalsConcededOutsideTheBox'] = 0
-        df_def['goalsConceded'] = df_def['goalsConcededInsideTheBox'] + df_def['goalsConcededOutsideTheBox']
-        cols = df_def.columns.tolist()
-        cols.remove('goalsConceded')
-        cols.remove('goalsConcededInsideTheBox')
-        cols.remove('goalsConcededOutsideTheBox')
-        player_index = cols.index('player')
-        cols.insert(player_index, 'goalsConcededOutsideTheBox')
-        cols.insert(player_index, 'goalsConcededInsideTheBox')
-        cols.insert(player_index, 'goalsConceded')
-        df_def = df_def[cols]
-        df_def['position'] = 'DF'
-       
-        df_mid = ss.scrape_player_league_stats(season, "England Premier League", "total", ["Midfielders"])
-        df_mid['goalsConcededInsideTheBox'] = 0
-        df_mid['goalsConcededOutsideTheBox'] = 0
-        df_mid['goalsConceded'] = df_mid['goalsConcededInsideTheBox'] + df_mid['goalsConcededOutsideTheBox']
-        cols = df_mid.columns.tolist()
-        cols.remove('goalsConceded')
-        cols.remove('goalsConcededInsideTheBox')
-        cols.remove('goalsConcededOutsideTheBox')
-        player_index = cols.index('player')
-        cols.insert(player_index, 'goalsConcededOutsideTheBox')
-        cols.insert(player_index, 'goalsConcededInsideTheBox')
-        cols.insert(player_index, 'goalsConceded')
-        df_mid = df_mid[cols]
-        df_mid['position'] = 'MF'
-      
-        df_fwd = ss.scrape_player_league_stats(season, "England Premier League", "total", ["Forwards"])
-        df_fwd['goalsConcededInsideTheBox'] = 0
-        df_fwd['goalsConcededOutsideTheBox'] = 0
-        df_fwd['goalsConceded'] = df_fwd['goalsConcededInsideTheBox'] + df_fwd['goalsConcededOutsideTheBox']
-        cols = df_fwd.columns.tolist()
-        cols.remove('goalsConceded')
-        cols.remove('goalsConcededInsideTheBox')
-        cols.remove('goalsConcededOutsideTheBox')
-        player_index = cols.index('player')
-        cols.insert(player_index, 'goalsConcededOutsideTheBox')
-        cols.insert(player_index, 'goalsConcededInsideTheBox')
-        cols.insert(player_index, 'goalsConceded')
-        df_fwd = df_fwd[cols]
-        df_fwd['position'] = 'FW'
-   
-        df_combined = pd.concat([df_gk, df_def, df_mid, df_fwd], ignore_index=True)
-
-        filename = f"EPL_STATS_{season_to_filename(season)}.csv"
-        
-        df_combined.to_csv(f"backend/data/processed/{filename}", index=False)
-        
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def checkpoint_path(season, position, checkpoint_dir=CHECKPOINT_DIR):
+    return os.path.join(checkpoint_dir, f"{season_to_filename(season)}_{position}.pkl")
+
+
+def fetch_position(ss, bucket, season, position, attempts=5):
+    """Fetch one (season, position) frame, retrying with exponential backoff."""
+    def fetch():
+        bucket.acquire()
+        return ss.scrape_player_league_stats(season, LEAGUE, "total", [POSITIONS[position]])
+
+    retrying = Retrying(
+        stop=stop_after_attempt(attempts),
+        wait=wait_exponential(multiplier=1, max=30),
+        reraise=True,
+    )
+    return retrying(fetch)
+
+
+def scrape_positions(ss, seasons, workers=4, rate=1.0, attempts=5, checkpoint_dir=CHECKPOINT_DIR):
+    """Scrape every (season, position) frame that is not already checkpointed.
+
+    Jobs run on a bounded thread pool that shares one rate limiter. Each
+    finished frame is pickled to `checkpoint_dir` straight away, so a failed
+    job only costs that job and a rerun picks up where this one stopped.
+    Returns {(season, position): exception} for the jobs that failed.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    bucket = TokenBucket(rate)
+    jobs = [
+        (season, position)
+        for season in seasons
+        for position in POSITIONS
+        if not os.path.exists(checkpoint_path(season, position, checkpoint_dir))
+    ]
+
+    failed = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_position, ss, bucket, season, position, attempts): (season, position)
+            for season, position in jobs
+        }
+        for future in as_completed(futures):
+            season, position = futures[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                failed[(season, position)] = e
+                print(f"Error scraping {position} for season {season}: {str(e)}")
+                continue
+
+            path = checkpoint_path(season, position, checkpoint_dir)
+            df.to_pickle(path + ".tmp")
+            os.replace(path + ".tmp", path)
+            print(f"Fetched {position} for season {season} ({len(df)} players)")
+
+    return failed
+
+
+def load_checkpoints(season, checkpoint_dir=CHECKPOINT_DIR):
+    """Return {position: frame} for a season, or None if any position is missing."""
+    paths = {position: checkpoint_path(season, position, checkpoint_dir) for position in POSITIONS}
+    if not all(os.path.exists(path) for path in paths.values()):
+        return None
+    return {position: pd.read_pickle(path) for position, path in paths.items()}
+
+
+def write_seasons(seasons, output_dir=OUTPUT_DIR, checkpoint_dir=CHECKPOINT_DIR):
+    for season in seasons:
+        frames = load_checkpoints(season, checkpoint_dir)
+        if frames is None:
+            print(f"Skipping season {season}: not every position has been scraped yet.")
+            continue
+
+        df_combined = combine_position_frames(frames)
+
+        # The name get_data's SEASON_FILES reads, so it also finds the Parquet cache.
+        filename = f"EPL_{season_to_filename(season)}.csv"
+
+        csv_path = os.path.join(output_dir, filename)
+        df_combined.to_csv(csv_path, index=False)
+        write_player_parquet(read_player_csv(csv_path), parquet_path(csv_path), content_hash(csv_path))
+
         print(f"{filename} created successfully! Total players: {len(df_combined)}")
-        
-    except Exception as e:
-        print(f"Error processing season {season}: {str(e)}")
 
-print("\nAll seasons processed!")
\ No newline at end of file
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Premier League player stats from Sofascore.")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent (season, position) jobs.")
+    parser.add_argument("--rate", type=float, default=1.0, help="Maximum requests per second.")
+    parser.add_argument("--attempts", type=int, default=5, help="Attempts per job before giving up.")
+    args = parser.parse_args()
+
+    import ScraperFC as sfc
+    ss = sfc.Sofascore()
+
+    failed = scrape_positions(ss, seasons, workers=args.workers, rate=args.rate, attempts=args.attempts)
+    write_seasons(seasons)
+
+    if failed:
+        print(f"\n{len(failed)} job(s) failed; rerun to fetch only the missing frames.")
+    else:
+        print("\nAll seasons processed!")
+
+
+if __name__ == "__main__":
+    main()
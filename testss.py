@@ -1,3 +1,6 @@
-import pandas as pd
-df = pd.read_csv("backend/data/processed/EPL_23_24.csv")
-print(df.columns.tolist())
+import sys
+sys.path.append("backend")
+from premier_league_backend.columns import read_player_frame
+
+df = read_player_frame("backend/data/processed/EPL_23_24.csv")
+print(df.columns.tolist())
\ No newline at end of file